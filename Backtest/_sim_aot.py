@@ -0,0 +1,37 @@
+"""
+Ahead-of-Time Build of the Simulation Kernel
+Compiles the _sim_njit kernels into the extension module sim_aot.
+
+JIT compilation (and loading the on-disk JIT cache) is paid again by every new
+process, which adds up when run_backtest is called repeatedly from fresh
+interpreters. Building once with numba.pycc turns the kernel into a plain
+extension module that imports like any other .so.
+
+Usage:
+    python _sim_aot.py
+
+test_template.py picks up sim_aot automatically when it has been built and
+falls back to the JIT kernel otherwise.
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+from _sim_njit import _simulate_trades, fused_dual_sma
+
+SIMULATE_TRADES_SIGNATURE = (
+    'Tuple((f8[:], f8[:, :], i8))(f4[:], f4[:], f4[:], f4[:], f8, f8, f8, f8)'
+)
+FUSED_DUAL_SMA_SIGNATURE = 'void(f4[:], i8, i8, f4[:], f4[:])'
+
+cc = CC('sim_aot')
+cc.output_dir = str(Path(__file__).resolve().parent)
+
+# Compile the same Python source as the JIT kernel so the two never diverge
+cc.export('simulate_trades', SIMULATE_TRADES_SIGNATURE)(_simulate_trades.py_func)
+cc.export('fused_dual_sma', FUSED_DUAL_SMA_SIGNATURE)(fused_dual_sma.py_func)
+
+
+if __name__ == '__main__':
+    cc.compile()
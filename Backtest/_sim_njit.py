@@ -0,0 +1,189 @@
+"""
+Numba Simulation Kernel
+Compiled trade simulation loop for the moving average crossover template.
+
+The indicators are computed vectorized in test_template.py; what remains is
+the sequential fill / stop-loss loop, which is compiled to native code here.
+If Numba is not installed the kernel runs as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        return lambda f: f
+
+
+@njit(cache=True)
+def _simulate_trades(open_, close, fast, slow, stop_loss_pct, position_size_pct,
+                     initial_cash, commission):
+    """
+    Run the moving average crossover rules in one pass over the price arrays.
+
+    Mirrors MovingAverageCrossStrategy bar for bar: crossovers follow
+    bt.indicators.CrossOver (compared against the last non-zero difference),
+    signals are evaluated on the close, market orders fill at the next bar's
+    open, a buy the cash cannot cover at that open is rejected, and commission
+    is charged as a fraction of traded value on both legs.
+
+    Args:
+        open_: Open prices (contiguous float32)
+        close: Close prices (contiguous float32)
+        fast: Fast SMA, float32 (NaN during warm-up)
+        slow: Slow SMA, float32 (NaN during warm-up)
+        stop_loss_pct: Stop loss as a fraction of entry price
+        position_size_pct: Fraction of cash committed per entry
+        initial_cash: Starting cash
+        commission: Commission as a fraction of traded value
+
+    Returns:
+        Tuple of (equity curve, closed trades, open position size). Each trade
+        row is [entry_idx, exit_idx, size, entry_price, exit_price, gross_pnl,
+        net_pnl].
+    """
+    n = close.shape[0]
+    equity = np.empty(n)
+    trades = np.empty((n // 2 + 1, 7))
+    n_trades = 0
+
+    cash = initial_cash
+    position = 0
+    entry_idx = -1
+    entry_price = 0.0
+    entry_comm = 0.0
+    last_sign = 0.0
+    pending = 0  # > 0: buy size submitted last bar, -1: close submitted last bar
+
+    for i in range(n):
+        # Fill the order submitted on the previous bar at this bar's open
+        if pending > 0:
+            cost = pending * open_[i]
+            comm = cost * commission
+            if cost + comm <= cash:
+                cash -= cost + comm
+                position = pending
+                entry_idx = i
+                entry_price = open_[i]
+                entry_comm = comm
+        elif pending < 0:
+            proceeds = position * open_[i]
+            comm = proceeds * commission
+            cash += proceeds - comm
+            gross = position * (open_[i] - entry_price)
+            trades[n_trades, 0] = entry_idx
+            trades[n_trades, 1] = i
+            trades[n_trades, 2] = position
+            trades[n_trades, 3] = entry_price
+            trades[n_trades, 4] = open_[i]
+            trades[n_trades, 5] = gross
+            trades[n_trades, 6] = gross - entry_comm - comm
+            n_trades += 1
+            position = 0
+        pending = 0
+
+        equity[i] = cash + position * close[i]
+
+        # Averages still warming up
+        diff = fast[i] - slow[i]
+        if np.isnan(diff):
+            continue
+
+        sign = np.sign(diff)
+        cross_up = last_sign < 0 and sign > 0
+        cross_down = last_sign > 0 and sign < 0
+        if sign != 0:
+            last_sign = sign
+
+        if position == 0:
+            if cross_up:
+                size = int((cash * position_size_pct) / close[i])
+                if size > 0:
+                    pending = size
+        elif cross_down or (close[i] - entry_price) / entry_price <= -stop_loss_pct:
+            pending = -1
+
+    return equity, trades[:n_trades], position
+
+
+@njit(cache=True)
+def fused_dual_sma(close, n_fast, n_slow, out_fast, out_slow):
+    """
+    Compute the fast and slow simple moving averages in a single pass.
+
+    Both running sums are updated from the same read of close[i], so the
+    series is streamed from memory once instead of once per average. The
+    sums are kept in float64, in which adding and removing float32 prices
+    is exact; a cumulative-sum SMA only matches that while its grand total
+    stays small enough to be exact too.
+
+    Args:
+        close: Close prices
+        n_fast: Fast SMA period
+        n_slow: Slow SMA period
+        out_fast: Output array for the fast SMA (NaN until its first full window)
+        out_slow: Output array for the slow SMA (NaN until its first full window)
+    """
+    n = close.shape[0]
+    sum_fast = 0.0
+    sum_slow = 0.0
+
+    for i in range(n):
+        price = np.float64(close[i])
+        sum_fast += price
+        sum_slow += price
+        if i >= n_fast:
+            sum_fast -= close[i - n_fast]
+        if i >= n_slow:
+            sum_slow -= close[i - n_slow]
+
+        out_fast[i] = sum_fast / n_fast if i >= n_fast - 1 else np.nan
+        out_slow[i] = sum_slow / n_slow if i >= n_slow - 1 else np.nan
+
+
+# Specialized simulators built by make_simulator, keyed by (fast_period, slow_period)
+_SIMULATORS = {}
+
+
+def make_simulator(fast_period, slow_period):
+    """
+    Return a simulator compiled for one fixed pair of SMA periods.
+
+    Numba freezes the closed-over periods as compile-time constants, so LLVM
+    can fold the divisions and window offsets in the (inlined) moving average
+    loop. Each pair compiles once per process on first call; closures cannot
+    use Numba's on-disk cache, so this only pays off when the same pair is
+    run many times or on long series.
+
+    Args:
+        fast_period: Fast SMA period
+        slow_period: Slow SMA period
+
+    Returns:
+        Function (open_, close, stop_loss_pct, position_size_pct, initial_cash,
+        commission) -> (equity, trades, open position size), as _simulate_trades
+    """
+    key = (int(fast_period), int(slow_period))
+    if key not in _SIMULATORS:
+        n_fast, n_slow = key
+
+        @njit(inline='always')
+        def dual_sma(close):
+            fast = np.empty_like(close)
+            slow = np.empty_like(close)
+            fused_dual_sma(close, n_fast, n_slow, fast, slow)
+            return fast, slow
+
+        @njit
+        def simulate(open_, close, stop_loss_pct, position_size_pct, initial_cash, commission):
+            fast, slow = dual_sma(close)
+            return _simulate_trades(open_, close, fast, slow, stop_loss_pct,
+                                    position_size_pct, initial_cash, commission)
+
+        _SIMULATORS[key] = simulate
+    return _SIMULATORS[key]
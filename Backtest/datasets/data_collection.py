@@ -24,18 +24,41 @@ Usage:
         interval='1d'
     )
     collector.validate_data(data)
-    collector.save_data(data, 'historical_prices.csv')
+    collector.save_data(data, 'historical_prices.parquet')
 """
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
 import yfinance as yf
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Union
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple, Union
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+import json
 import logging
+import os
+import time
 import warnings
 
-warnings.filterwarnings('ignore')
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; validate_data falls back to pandas
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +67,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum number of tickers requested per batched Yahoo download
+YAHOO_BATCH_SIZE = 20
+
+# Thread pool size for per-symbol fallback downloads (network-bound)
+MAX_DOWNLOAD_WORKERS = 16
+
+# Interval suffixes yf.download keeps timezone-aware dates for; every other
+# interval comes back tz-naive (yfinance's ignore_tz default)
+INTRADAY_INTERVAL_SUFFIXES = ('m', 'h')
+
+# yfinance column names mapped to the standardized snake_case names
+RENAMED_COLUMNS = {
+    'Date': 'date',
+    'Datetime': 'date',
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Adj Close': 'adj_close',
+    'Volume': 'volume',
+    'Dividends': 'dividends',
+    'Stock Splits': 'stock_splits',
+    'Capital Gains': 'capital_gains',
+    'Symbol': 'symbol',
+}
+
+# Column layout shared by every per-symbol/per-batch frame before concatenation
+STANDARD_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'symbol']
+
+# Rows per Parquet row group when saving (bounds memory on partial reads)
+PARQUET_ROW_GROUP_SIZE = 200_000
+
+# Column dtypes applied when reading CSV files (volume is left to inference
+# because USD-denominated crypto volume can exceed int32)
+CSV_DTYPES = {
+    'open': 'float32',
+    'high': 'float32',
+    'low': 'float32',
+    'close': 'float32',
+    'symbol': 'category',
+}
+
+# Parquet footer key holding the collector metadata
+PARQUET_METADATA_KEY = b'collector_meta'
+
+# Default location of the per-symbol Parquet download cache
+DEFAULT_CACHE_DIR = Path('~/.cache/data_collector').expanduser()
+
+# Parquet footer key holding the date range a cache file covers
+CACHE_RANGE_KEY = b'cache_range'
+
+# Seconds to wait for another process to release a cache file lock
+CACHE_LOCK_TIMEOUT = 30.0
+
+# Consecutive bars further apart than this are reported as data gaps (7 days)
+GAP_THRESHOLD_NS = 7 * 86_400 * 1_000_000_000
+
+
+@njit(cache=True)
+def _count_sorted_duplicates(codes: np.ndarray, ts: np.ndarray, n_symbols: int) -> np.ndarray:
+    """Count repeated (code, timestamp) pairs per code in rows sorted by (code, ts)."""
+    counts = np.zeros(n_symbols, dtype=np.int64)
+    for i in range(1, codes.shape[0]):
+        if codes[i] >= 0 and codes[i] == codes[i - 1] and ts[i] == ts[i - 1]:
+            counts[codes[i]] += 1
+    return counts
+
+
+@contextmanager
+def _file_lock(path: Path, timeout: float = CACHE_LOCK_TIMEOUT):
+    """
+    Hold an exclusive advisory lock on ``path`` via a sibling ``.lock`` file.
+    
+    The OS releases the lock when its holder exits, so a crashed or killed
+    process cannot leave a stale lock behind. The lock file itself is left in
+    place; only the lock on it matters.
+    """
+    lock_path = path.with_name(path.name + '.lock')
+    deadline = time.monotonic() + timeout
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for cache lock {lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
 
 class DataCollector:
     """
@@ -52,20 +178,28 @@ class DataCollector:
     Attributes:
         source (str): Data source ('yahoo', 'alphavantage', etc.)
         api_key (str): API key for paid sources
+        cache_dir (Path): Directory of cached downloads (None disables caching)
     """
     
-    def __init__(self, source: str = 'yahoo', api_key: Optional[str] = None):
+    def __init__(
+        self,
+        source: str = 'yahoo',
+        api_key: Optional[str] = None,
+        cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR
+    ):
         """
         Initialize DataCollector.
         
         Args:
             source: Data source to use ('yahoo', 'alphavantage')
             api_key: API key for sources that require authentication
+            cache_dir: Directory for the per-symbol Parquet download cache;
+                pass None to always download
         """
         self.source = source.lower()
         self.api_key = api_key
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir is not None else None
         self.metadata = {
-            'collection_date': datetime.now().isoformat(),
             'source': self.source,
             'version': '1.0'
         }
@@ -97,11 +231,15 @@ class DataCollector:
         logger.info(f"Fetching data for {len(symbols)} symbol(s) from {start_date} to {end_date}")
         
         if self.source == 'yahoo':
-            return self._fetch_yahoo(symbols, start_date, end_date, interval)
+            data = self._fetch_yahoo(symbols, start_date, end_date, interval)
         elif self.source == 'alphavantage':
-            return self._fetch_alphavantage(symbols, start_date, end_date, interval)
+            data = self._fetch_alphavantage(symbols, start_date, end_date, interval)
         else:
             raise ValueError(f"Unsupported data source: {self.source}")
+        
+        # Stamp the actual collection event in UTC so runs are comparable
+        self.metadata['collection_date'] = datetime.now(timezone.utc).isoformat()
+        return data
     
     def _fetch_yahoo(
         self,
@@ -110,43 +248,31 @@ class DataCollector:
         end_date: str,
         interval: str
     ) -> pd.DataFrame:
-        """Fetch data from Yahoo Finance using yfinance."""
-        data_frames = []
+        """Fetch data from Yahoo Finance, serving cached history where possible."""
+        # Shared vocabulary keeps every frame's symbol codes compatible for concat
+        symbol_dtype = pd.CategoricalDtype(categories=symbols)
         
-        for symbol in symbols:
-            try:
-                logger.info(f"Downloading {symbol}...")
-                ticker = yf.Ticker(symbol)
-                df = ticker.history(
-                    start=start_date,
-                    end=end_date,
-                    interval=interval,
-                    auto_adjust=True  # Adjust for splits and dividends
-                )
-                
-                if df.empty:
-                    logger.warning(f"No data returned for {symbol}")
-                    continue
-                
-                # Add symbol column
-                df['Symbol'] = symbol
-                df.reset_index(inplace=True)
-                
-                # Standardize column names
-                df.columns = [col.lower().replace(' ', '_') for col in df.columns]
-                
-                data_frames.append(df)
-                logger.info(f"Successfully downloaded {len(df)} rows for {symbol}")
-                
-            except Exception as e:
-                logger.error(f"Error fetching {symbol}: {str(e)}")
-                continue
+        if self.cache_dir is None:
+            data_frames = self._download_yahoo(
+                symbols, start_date, end_date, interval, symbol_dtype
+            )
+        else:
+            data_frames = self._fetch_yahoo_cached(
+                symbols, start_date, end_date, interval, symbol_dtype
+            )
         
         if not data_frames:
             raise ValueError("No data was successfully fetched")
         
+        # Batched, per-symbol and cached frames must agree on tz-awareness, or
+        # the stacked date column degrades to objects that cannot be compared
+        date_dtypes = {str(df['date'].dtype) for df in data_frames}
+        if len({dtype.startswith('datetime64[') for dtype in date_dtypes}) > 1:
+            raise ValueError(f"Fetched frames mix tz-naive and tz-aware dates: "
+                             f"{sorted(date_dtypes)}")
+        
         # Combine all data
-        combined_data = pd.concat(data_frames, ignore_index=True)
+        combined_data = self._stack_frames(data_frames)
         
         # Store metadata
         self.metadata.update({
@@ -159,6 +285,389 @@ class DataCollector:
         
         return combined_data
     
+    def _fetch_yahoo_cached(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        symbol_dtype: pd.CategoricalDtype
+    ) -> List[pd.DataFrame]:
+        """
+        Serve symbols from the Parquet cache, downloading only uncovered ranges.
+        
+        Each (symbol, interval) pair is cached in one file whose footer records
+        the date range it covers. Requests reaching outside that range download
+        just the missing head and/or tail, batched across symbols that need the
+        same window. A window that returns no rows is not marked covered, so a
+        failed download is retried on the next call instead of leaving a gap.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date)
+        # Bars from today onward may still change, so they are never marked covered
+        covered_end = min(end, pd.Timestamp.now().normalize())
+        
+        # Group symbols by the window they still need so downloads stay batched
+        cached = {}
+        pending = defaultdict(list)
+        for symbol in symbols:
+            cached[symbol], cached_range = self._read_cache(symbol, interval)
+            if cached_range is None:
+                pending[(start, end)].append(symbol)
+                continue
+            if start < cached_range[0]:
+                pending[(start, cached_range[0])].append(symbol)
+            if end > cached_range[1]:
+                pending[(cached_range[1], end)].append(symbol)
+        
+        downloaded = defaultdict(list)
+        fetched_windows = defaultdict(list)
+        for (window_start, window_end), group in pending.items():
+            logger.info(f"Cache miss for {len(group)} symbol(s) "
+                       f"from {window_start.date()} to {window_end.date()}")
+            frames = self._download_yahoo(
+                group,
+                window_start.strftime('%Y-%m-%d'),
+                window_end.strftime('%Y-%m-%d'),
+                interval,
+                symbol_dtype
+            )
+            returned = set()
+            for df in frames:
+                for symbol, rows in df.groupby('symbol', observed=True, sort=False):
+                    downloaded[symbol].append(rows)
+                    fetched_windows[symbol].append((window_start, min(window_end, covered_end)))
+                    returned.add(symbol)
+            
+            # Windows that returned nothing stay uncovered so the next call retries them
+            failed = [symbol for symbol in group if symbol not in returned]
+            if failed:
+                logger.warning(f"No data for {', '.join(failed)} from {window_start.date()} "
+                               f"to {window_end.date()}; range left uncovered in the cache")
+        
+        data_frames = []
+        for symbol in symbols:
+            df = cached[symbol]
+            if downloaded[symbol]:
+                df = self._update_cache(
+                    symbol, interval, downloaded[symbol], fetched_windows[symbol]
+                )
+            elif df is not None:
+                logger.info(f"Loaded {symbol} from cache")
+            if df is None:
+                continue
+            
+            # Slice the requested [start, end) window in exchange-local time
+            dates = df['date'].dt.tz_localize(None) if df['date'].dt.tz is not None else df['date']
+            df = df[(dates >= start) & (dates < end)]
+            if not df.empty:
+                data_frames.append(df.astype({'symbol': symbol_dtype}).reset_index(drop=True))
+        
+        return data_frames
+    
+    def _cache_path(self, symbol: str, interval: str) -> Path:
+        """Path of the cache file for one (symbol, interval) pair."""
+        return self.cache_dir / f"{symbol}_{interval}.parquet"
+    
+    def _read_cache(
+        self,
+        symbol: str,
+        interval: str
+    ) -> Tuple[Optional[pd.DataFrame], Optional[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """Read a cache file, returning (data, covered range) or (None, None)."""
+        path = self._cache_path(symbol, interval)
+        if not path.exists():
+            return None, None
+        
+        table = pq.read_table(path)
+        cached_range = (table.schema.metadata or {}).get(CACHE_RANGE_KEY)
+        if cached_range is None:
+            # Not written by _update_cache (e.g. save_data output or an older version)
+            logger.warning(f"Cache file {path} has no covered range; re-downloading")
+            return None, None
+        cached_range = json.loads(cached_range)
+        return table.to_pandas(), tuple(pd.Timestamp(ts) for ts in cached_range)
+    
+    def _update_cache(
+        self,
+        symbol: str,
+        interval: str,
+        new_frames: List[pd.DataFrame],
+        fetched_windows: List[Tuple[pd.Timestamp, pd.Timestamp]]
+    ) -> pd.DataFrame:
+        """
+        Merge newly downloaded rows into a symbol's cache file and rewrite it.
+        
+        The file is re-read under the lock so concurrent writers do not drop each
+        other's rows, and replaced atomically so readers never see a partial file.
+        The covered range is only extended across fetched windows that touch it,
+        so a window that failed to download leaves a gap that is fetched again.
+        
+        Args:
+            symbol: Ticker symbol
+            interval: Data interval
+            new_frames: Downloaded rows for the symbol
+            fetched_windows: (start, end) windows that returned rows, with end
+                clamped to the last bar that may be marked covered
+        
+        Returns:
+            The merged cache contents
+        """
+        path = self._cache_path(symbol, interval)
+        with _file_lock(path):
+            cached, covered = self._read_cache(symbol, interval)
+            frames = new_frames if cached is None else [cached] + new_frames
+            df = pd.concat(
+                [frame.astype({'symbol': 'str'}) for frame in frames], ignore_index=True
+            )
+            df = (
+                df.drop_duplicates(subset='date', keep='last')
+                .sort_values('date', ignore_index=True)
+            )
+            
+            for window_start, window_end in sorted(fetched_windows):
+                if window_end < window_start:
+                    continue
+                if covered is None:
+                    covered = (window_start, window_end)
+                elif window_start <= covered[1] and window_end >= covered[0]:
+                    covered = (min(covered[0], window_start), max(covered[1], window_end))
+            
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if covered is not None:
+                table = table.replace_schema_metadata({
+                    **(table.schema.metadata or {}),
+                    CACHE_RANGE_KEY: json.dumps([ts.isoformat() for ts in covered]).encode()
+                })
+            
+            tmp_path = path.with_name(path.name + '.tmp')
+            pq.write_table(table, tmp_path, compression='snappy')
+            os.replace(tmp_path, path)
+        
+        logger.info(f"Cached {len(df)} rows for {symbol} at {path}")
+        return df
+    
+    def _download_yahoo(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        symbol_dtype: pd.CategoricalDtype
+    ) -> List[pd.DataFrame]:
+        """Download symbols from Yahoo Finance in batched yfinance requests."""
+        data_frames = []
+        
+        for i in range(0, len(symbols), YAHOO_BATCH_SIZE):
+            chunk = symbols[i:i + YAHOO_BATCH_SIZE]
+            try:
+                logger.info(f"Downloading {', '.join(chunk)}...")
+                with warnings.catch_warnings():
+                    # yfinance emits FutureWarnings from its own pandas usage
+                    warnings.simplefilter('ignore', category=FutureWarning)
+                    raw = yf.download(
+                        " ".join(chunk),
+                        start=start_date,
+                        end=end_date,
+                        interval=interval,
+                        auto_adjust=True,  # Adjust for splits and dividends
+                        group_by='ticker',
+                        threads=True,
+                        progress=False
+                    )
+                
+                if raw.empty:
+                    logger.warning(f"No data returned for {', '.join(chunk)}")
+                    continue
+                
+                # Reshape (ticker, field) columns into one row per (date, symbol)
+                fields = list(raw.columns.get_level_values(1).unique())
+                df = (
+                    raw.stack(level=0)
+                    .rename_axis(['date', 'symbol'])
+                    .reset_index()
+                    .rename_axis(columns=None)
+                )
+                df = df.dropna(subset=fields, how='all')
+                df = df.sort_values(['symbol', 'date'], ignore_index=True)
+                
+                # Standardize column names and order
+                df = df.rename(columns=RENAMED_COLUMNS)
+                df = self._downcast_ohlcv(df.reindex(columns=STANDARD_COLUMNS), symbol_dtype)
+                
+                missing = [symbol for symbol in chunk if symbol not in set(df['symbol'])]
+                for symbol in missing:
+                    logger.warning(f"No data returned for {symbol}")
+                
+                data_frames.append(df)
+                logger.info(f"Successfully downloaded {len(df)} rows for "
+                           f"{len(chunk) - len(missing)} symbol(s)")
+                
+            except Exception as e:
+                logger.error(f"Error fetching {', '.join(chunk)}: {str(e)}")
+                logger.info("Falling back to per-symbol downloads for this batch")
+                data_frames.extend(
+                    self._fetch_yahoo_threaded(
+                        chunk, start_date, end_date, interval, symbol_dtype
+                    )
+                )
+        
+        return data_frames
+    
+    def _fetch_yahoo_threaded(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        symbol_dtype: pd.CategoricalDtype
+    ) -> List[pd.DataFrame]:
+        """Fetch symbols one request each, issuing the requests concurrently."""
+        with ThreadPoolExecutor(max_workers=min(MAX_DOWNLOAD_WORKERS, len(symbols))) as ex:
+            results = list(ex.map(
+                lambda symbol: self._download_one(
+                    symbol, start_date, end_date, interval, symbol_dtype
+                ),
+                symbols
+            ))
+        
+        return [df for df in results if df is not None]
+    
+    def _download_one(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str,
+        symbol_dtype: pd.CategoricalDtype
+    ) -> Optional[pd.DataFrame]:
+        """Download a single symbol from Yahoo Finance, returning None on failure."""
+        try:
+            logger.info(f"Downloading {symbol}...")
+            ticker = yf.Ticker(symbol)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=FutureWarning)
+                df = ticker.history(
+                    start=start_date,
+                    end=end_date,
+                    interval=interval,
+                    auto_adjust=True  # Adjust for splits and dividends
+                )
+            
+            if df.empty:
+                logger.warning(f"No data returned for {symbol}")
+                return None
+            
+            # Ticker.history always returns exchange-local aware dates; drop the
+            # zone like the batched yf.download does so the frames can be stacked
+            if not interval.endswith(INTRADAY_INTERVAL_SUFFIXES):
+                df.index = df.index.tz_localize(None)
+            
+            # Add symbol column (categorical with the full requested vocabulary)
+            df['Symbol'] = pd.Categorical.from_codes(
+                np.full(len(df), symbol_dtype.categories.get_loc(symbol), dtype=np.int32),
+                dtype=symbol_dtype
+            )
+            
+            # Standardize column names and order
+            df = df.reset_index().rename(columns=RENAMED_COLUMNS)
+            df = self._downcast_ohlcv(df.reindex(columns=STANDARD_COLUMNS), symbol_dtype)
+            
+            logger.info(f"Successfully downloaded {len(df)} rows for {symbol}")
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error fetching {symbol}: {str(e)}")
+            return None
+    
+    def _downcast_ohlcv(
+        self,
+        df: pd.DataFrame,
+        symbol_dtype: pd.CategoricalDtype
+    ) -> pd.DataFrame:
+        """
+        Narrow OHLCV columns to float32 prices and int32 volume.
+        
+        Volume stays at its original dtype when it has missing values or does not
+        fit in int32 (e.g. crypto pairs quoted in USD volume).
+        
+        Args:
+            df: Frame with STANDARD_COLUMNS layout
+            symbol_dtype: Categorical dtype covering every requested symbol
+        
+        Returns:
+            DataFrame with downcast dtypes
+        """
+        dtypes = {col: 'float32' for col in ['open', 'high', 'low', 'close']}
+        
+        prices = df[list(dtypes)].to_numpy(dtype=np.float64)
+        if np.isnan(prices).any():
+            logger.warning(f"Missing prices in {int(np.isnan(prices).any(axis=1).sum())} rows")
+        
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        if np.isnan(volume).any():
+            logger.warning("Missing volume values; volume not downcast to int32")
+        elif (volume > np.iinfo(np.int32).max).any():
+            logger.warning("Volume exceeds int32 range; volume kept as int64")
+            dtypes['volume'] = 'int64'
+        else:
+            dtypes['volume'] = 'int32'
+        
+        dtypes['symbol'] = symbol_dtype
+        return df.astype(dtypes)
+    
+    def _stack_frames(self, data_frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Stack frames sharing the STANDARD_COLUMNS layout into one DataFrame.
+        
+        Each column is allocated once at its final length and filled with one
+        slice copy per frame, skipping pd.concat's index alignment. Columns whose
+        dtype differs between frames fall back to pd.concat.
+        
+        Args:
+            data_frames: Non-empty list of frames with identical columns
+        
+        Returns:
+            Combined DataFrame with a fresh RangeIndex
+        """
+        n = sum(len(df) for df in data_frames)
+        columns = {}
+        
+        for col in STANDARD_COLUMNS:
+            dtype = data_frames[0][col].dtype
+            if any(df[col].dtype != dtype for df in data_frames):
+                columns[col] = pd.concat([df[col] for df in data_frames], ignore_index=True)
+                continue
+            
+            # Categoricals copy their integer codes; tz-aware dates copy UTC values
+            if isinstance(dtype, pd.CategoricalDtype):
+                arr = np.empty(n, dtype=data_frames[0][col].cat.codes.dtype)
+                extract = lambda s: s.cat.codes.to_numpy()
+            elif isinstance(dtype, np.dtype):
+                arr = np.empty(n, dtype=dtype)
+                extract = lambda s: s.to_numpy()
+            elif isinstance(dtype, pd.DatetimeTZDtype):
+                arr = np.empty(n, dtype=f'datetime64[{dtype.unit}]')
+                extract = lambda s: s.values
+            else:
+                columns[col] = pd.concat([df[col] for df in data_frames], ignore_index=True)
+                continue
+            
+            offset = 0
+            for df in data_frames:
+                arr[offset:offset + len(df)] = extract(df[col])
+                offset += len(df)
+            
+            if isinstance(dtype, pd.CategoricalDtype):
+                columns[col] = pd.Categorical.from_codes(arr, dtype=dtype)
+            elif isinstance(dtype, pd.DatetimeTZDtype):
+                columns[col] = pd.Series(arr).dt.tz_localize('UTC').dt.tz_convert(dtype.tz)
+            else:
+                columns[col] = arr
+        
+        return pd.DataFrame(columns)
+    
     def _fetch_alphavantage(
         self,
         symbols: List[str],
@@ -187,12 +696,23 @@ class DataCollector:
         validation_results = {
             'total_rows': len(data),
             'symbols': data['symbol'].nunique() if 'symbol' in data.columns else 1,
-            'date_range': (data['date'].min(), data['date'].max()) if 'date' in data.columns else None,
+            'date_range': None,
             'issues': []
         }
-        
-        # Check for missing values
-        missing_values = data.isnull().sum()
+        if 'date' in data.columns:
+            date_bounds = data['date'].agg(['min', 'max'])
+            validation_results['date_range'] = (date_bounds['min'], date_bounds['max'])
+        
+        # Pull the price block once; null, sign and OHLC checks all reuse it
+        price_cols = [col for col in ['open', 'high', 'low', 'close'] if col in data.columns]
+        prices = data[price_cols].to_numpy()
+        
+        # Check for missing values (price columns from the NaN mask of the block)
+        other_cols = [col for col in data.columns if col not in price_cols]
+        missing_values = pd.concat([
+            pd.Series(np.isnan(prices).sum(axis=0), index=price_cols),
+            data[other_cols].isnull().sum()
+        ]).reindex(data.columns)
         if missing_values.any():
             validation_results['issues'].append({
                 'type': 'missing_values',
@@ -200,39 +720,51 @@ class DataCollector:
             })
             logger.warning(f"Missing values detected: {missing_values[missing_values > 0].to_dict()}")
         
+        # Order rows by (symbol, date) once; the duplicate and gap checks both
+        # walk this sorted int64 view
+        if 'date' in data.columns:
+            ts = data['date'].values.astype('datetime64[ns]').view('i8')
+            if 'symbol' in data.columns:
+                codes, uniques = pd.factorize(data['symbol'])
+            else:
+                codes = np.zeros(len(ts), dtype=np.intp)
+            order = np.lexsort((ts, codes))
+            ts, codes = ts[order], codes[order]
+        
         # Check for duplicate dates per symbol
         if 'date' in data.columns and 'symbol' in data.columns:
-            duplicates = data.groupby('symbol')['date'].apply(
-                lambda x: x.duplicated().sum()
-            )
-            if duplicates.any():
+            if NUMBA_AVAILABLE:
+                duplicates = pd.Series(
+                    _count_sorted_duplicates(codes, ts, len(uniques)), index=uniques
+                )
+            else:
+                dup_mask = data.duplicated(subset=['symbol', 'date'])
+                duplicates = dup_mask.groupby(data['symbol']).sum()
+            duplicates = duplicates[duplicates > 0]
+            if not duplicates.empty:
                 validation_results['issues'].append({
                     'type': 'duplicate_dates',
-                    'details': duplicates[duplicates > 0].to_dict()
+                    'details': duplicates.to_dict()
                 })
-                logger.warning(f"Duplicate dates found: {duplicates[duplicates > 0].to_dict()}")
+                logger.warning(f"Duplicate dates found: {duplicates.to_dict()}")
         
         # Check for zero/negative prices
-        price_cols = ['open', 'high', 'low', 'close']
-        for col in price_cols:
-            if col in data.columns:
-                invalid_prices = (data[col] <= 0).sum()
-                if invalid_prices > 0:
-                    validation_results['issues'].append({
-                        'type': f'invalid_{col}_prices',
-                        'count': invalid_prices
-                    })
-                    logger.warning(f"Found {invalid_prices} invalid {col} prices (<= 0)")
+        nonpositive_counts = (prices <= 0).sum(axis=0)
+        for col, invalid_prices in zip(price_cols, nonpositive_counts):
+            if invalid_prices > 0:
+                validation_results['issues'].append({
+                    'type': f'invalid_{col}_prices',
+                    'count': int(invalid_prices)
+                })
+                logger.warning(f"Found {invalid_prices} invalid {col} prices (<= 0)")
         
         # Check OHLC relationships (High >= Low, High >= Open/Close, etc.)
-        if all(col in data.columns for col in ['open', 'high', 'low', 'close']):
-            invalid_ohlc = (
-                (data['high'] < data['low']) |
-                (data['high'] < data['open']) |
-                (data['high'] < data['close']) |
-                (data['low'] > data['open']) |
-                (data['low'] > data['close'])
-            ).sum()
+        if len(price_cols) == 4:
+            # High must be the row maximum and Low the row minimum of O/H/L/C
+            invalid_ohlc = int((
+                (prices[:, 1] < prices.max(axis=1)) |
+                (prices[:, 2] > prices.min(axis=1))
+            ).sum())
             
             if invalid_ohlc > 0:
                 validation_results['issues'].append({
@@ -243,15 +775,18 @@ class DataCollector:
         
         # Check for data gaps
         if 'date' in data.columns:
-            data_sorted = data.sort_values('date')
-            date_diffs = data_sorted['date'].diff()
+            # Diff within each symbol only, skipping steps that cross from one
+            # symbol to the next or start from a NaT
+            same_symbol = (codes[1:] == codes[:-1]) & (ts[:-1] != np.iinfo(np.int64).min)
+            date_diffs = np.diff(ts)[same_symbol]
+            
             # Look for gaps > 7 days (for daily data)
-            large_gaps = date_diffs[date_diffs > pd.Timedelta(days=7)]
+            large_gaps = date_diffs[date_diffs > GAP_THRESHOLD_NS]
             if len(large_gaps) > 0:
                 validation_results['issues'].append({
                     'type': 'data_gaps',
                     'count': len(large_gaps),
-                    'max_gap': str(large_gaps.max())
+                    'max_gap': str(pd.Timedelta(int(large_gaps.max()), unit='ns'))
                 })
                 logger.warning(f"Found {len(large_gaps)} data gaps > 7 days")
         
@@ -270,6 +805,9 @@ class DataCollector:
         """
         Handle missing data using specified method.
         
+        Forward fill and interpolation run within each symbol, so values never
+        leak from one symbol's history into the next.
+        
         Args:
             data: DataFrame with potential missing values
             method: Method to use ('forward_fill', 'drop', 'interpolate')
@@ -279,20 +817,39 @@ class DataCollector:
         """
         logger.info(f"Handling missing data using method: {method}")
         
-        if method == 'forward_fill':
-            return data.fillna(method='ffill')
-        elif method == 'drop':
+        if method == 'drop':
             return data.dropna()
-        elif method == 'interpolate':
-            return data.interpolate(method='linear')
-        else:
+        if method not in ('forward_fill', 'interpolate'):
             raise ValueError(f"Unknown method: {method}")
+        
+        numeric = [col for col in ['open', 'high', 'low', 'close', 'volume'] if col in data.columns]
+        if 'symbol' in data.columns:
+            grouped = data.groupby('symbol', sort=False, observed=True)
+        else:
+            grouped = None
+        
+        data = data.copy()
+        if method == 'forward_fill':
+            fill_cols = [col for col in data.columns if col != 'symbol']
+            if grouped is not None:
+                data[fill_cols] = grouped[fill_cols].ffill()
+            else:
+                data[fill_cols] = data[fill_cols].ffill()
+        else:
+            if grouped is not None:
+                data[numeric] = grouped[numeric].transform(
+                    lambda s: s.interpolate(method='linear')
+                )
+            else:
+                data[numeric] = data[numeric].interpolate(method='linear')
+        
+        return data
     
     def save_data(
         self,
         data: pd.DataFrame,
         filename: str,
-        format: str = 'csv',
+        format: str = 'parquet',
         include_metadata: bool = True
     ):
         """
@@ -302,54 +859,107 @@ class DataCollector:
             data: DataFrame to save
             filename: Output filename
             format: File format ('csv', 'parquet', 'hdf5')
-            include_metadata: Whether to save metadata separately
+            include_metadata: Whether to save metadata (embedded in the file footer
+                for Parquet, as a side-car JSON file otherwise)
         """
         logger.info(f"Saving data to {filename} in {format} format...")
         
         if format == 'csv':
-            data.to_csv(filename, index=False)
+            # Arrow's C++ writer formats numbers far faster than DataFrame.to_csv
+            pv.write_csv(
+                pa.Table.from_pandas(data, preserve_index=False),
+                filename,
+                write_options=pv.WriteOptions(include_header=True)
+            )
         elif format == 'parquet':
-            data.to_parquet(filename, index=False)
+            # Dictionary-encode the repeated symbol strings in the columnar file;
+            # pyarrow round-trips the categorical dtype (CSV cannot)
+            if 'symbol' in data.columns and not isinstance(data['symbol'].dtype, pd.CategoricalDtype):
+                data = data.assign(symbol=data['symbol'].astype('category'))
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            if include_metadata:
+                # Data and metadata are written together in a single file
+                table = table.replace_schema_metadata({
+                    **(table.schema.metadata or {}),
+                    PARQUET_METADATA_KEY: json.dumps(self.metadata).encode()
+                })
+            pq.write_table(
+                table,
+                filename,
+                compression='snappy',
+                row_group_size=PARQUET_ROW_GROUP_SIZE
+            )
         elif format == 'hdf5':
-            data.to_hdf(filename, key='data', mode='w')
+            # Table format with indexed date/symbol columns supports filtered reads
+            data.to_hdf(
+                filename,
+                key='data',
+                mode='w',
+                format='table',
+                complib='blosc:lz4',
+                complevel=5,
+                data_columns=[col for col in ['date', 'symbol'] if col in data.columns]
+            )
         else:
             raise ValueError(f"Unsupported format: {format}")
         
         logger.info(f"✓ Data saved successfully: {len(data)} rows")
         
         # Save metadata
-        if include_metadata:
+        if include_metadata and format != 'parquet':
             metadata_file = filename.rsplit('.', 1)[0] + '_metadata.json'
-            import json
             with open(metadata_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
             logger.info(f"✓ Metadata saved to {metadata_file}")
     
-    def load_data(self, filename: str, format: str = 'csv') -> pd.DataFrame:
+    def load_data(
+        self,
+        filename: str,
+        format: str = 'parquet',
+        where: Optional[str] = None
+    ) -> pd.DataFrame:
         """
         Load previously saved data.
         
         Args:
             filename: Input filename
             format: File format ('csv', 'parquet', 'hdf5')
+            where: HDF5 only - PyTables query evaluated inside the file scan,
+                e.g. "date >= '2020-01-01' and symbol == 'AAPL'"
         
         Returns:
             Loaded DataFrame
         """
         logger.info(f"Loading data from {filename}...")
         
+        if where is not None and format != 'hdf5':
+            raise ValueError("The 'where' filter is only supported for hdf5 files")
+        
         if format == 'csv':
-            data = pd.read_csv(filename)
+            # Arrow's multithreaded parser reads straight into typed columns and
+            # parses dates during the read, replacing a separate to_datetime pass
+            header = pd.read_csv(filename, nrows=0).columns
+            data = pd.read_csv(
+                filename,
+                engine='pyarrow',
+                dtype=CSV_DTYPES,
+                parse_dates=['date'] if 'date' in header else None
+            )
         elif format == 'parquet':
-            data = pd.read_parquet(filename)
+            # Parquet keeps the datetime64 dtype, so no date re-parse is needed
+            table = pq.read_table(filename)
+            file_metadata = table.schema.metadata or {}
+            if PARQUET_METADATA_KEY in file_metadata:
+                self.metadata = json.loads(file_metadata[PARQUET_METADATA_KEY])
+            data = table.to_pandas()
         elif format == 'hdf5':
-            data = pd.read_hdf(filename, key='data')
+            data = pd.read_hdf(filename, key='data', where=where)
         else:
             raise ValueError(f"Unsupported format: {format}")
         
-        # Convert date column if present
-        if 'date' in data.columns:
-            data['date'] = pd.to_datetime(data['date'])
+        # Symbols compare and group as integer codes rather than strings
+        if 'symbol' in data.columns and not isinstance(data['symbol'].dtype, pd.CategoricalDtype):
+            data['symbol'] = data['symbol'].astype('category')
         
         logger.info(f"✓ Loaded {len(data)} rows")
         return data
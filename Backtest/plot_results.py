@@ -0,0 +1,55 @@
+"""
+Backtest Results Plotting
+Charts the trades file written by test_template.py.
+
+Plotting is kept out of the backtest itself so that runs and parameter sweeps
+stay headless; render the results afterwards, as often as needed.
+
+Usage:
+    python plot_results.py [trades_file]
+
+The trades file defaults to CONFIG['trades_file'] (backtest_trades.parquet).
+"""
+
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+DEFAULT_TRADES_FILE = 'backtest_trades.parquet'
+
+
+def plot_trades(trades_file):
+    """
+    Plot cumulative net P&L and per-trade net P&L.
+
+    Args:
+        trades_file: Path to the trades Parquet file
+    """
+    trades = pd.read_parquet(trades_file)
+    if trades.empty:
+        print(f"No closed trades in {trades_file}")
+        return
+
+    pnl = trades['pnlcomm'].to_numpy()
+
+    fig, (ax_equity, ax_trades) = plt.subplots(2, 1, sharex=True, figsize=(12, 8))
+
+    ax_equity.step(trades['exit_date'], np.cumsum(pnl), where='post', color='steelblue')
+    ax_equity.set_ylabel('Cumulative Net P&L')
+    ax_equity.set_title(f'Closed Trades ({len(trades)})')
+    ax_equity.grid(alpha=0.3)
+
+    ax_trades.bar(trades['exit_date'], pnl, width=3,
+                  color=np.where(pnl >= 0, 'green', 'red'))
+    ax_trades.axhline(0, color='black', linewidth=0.8)
+    ax_trades.set_ylabel('Net P&L per Trade')
+    ax_trades.grid(alpha=0.3)
+
+    fig.tight_layout()
+    plt.show()
+
+
+if __name__ == '__main__':
+    plot_trades(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TRADES_FILE)
@@ -0,0 +1,315 @@
+"""
+PyPy Backtest Entry Point
+Runs the moving average crossover template on the Backtrader engine under PyPy.
+
+test_template.py leans on NumPy, pandas and Numba, which PyPy either runs
+through its slow C-API emulation or not at all. This entry point sticks to
+Backtrader and the standard library (csv + lists), so PyPy's tracing JIT can
+specialize Backtrader's per-bar next()/LineBuffer dispatch instead. Useful for
+long event-driven backtests (e.g. minute bars over several years); the rules
+and fills are the same as the template's 'backtrader' engine.
+
+Usage:
+    pypy3 -m pip install backtrader
+    pypy3 run_backtest_pypy.py
+
+CONFIG and the strategy rules are kept in step with test_template.py by hand;
+verify them under CPython (which can import the template) with:
+    python run_backtest_pypy.py --check-parity
+"""
+
+import backtrader as bt
+import csv
+import datetime
+import logging
+import math
+import sys
+import time
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# ==================== CONFIGURATION ====================
+
+CONFIG = {
+    # Data settings
+    'data_file': 'datasets/historical_data.csv',  # Path to your data file
+    'symbol': 'AAPL',  # Symbol to backtest (if multiple in file)
+    'start_date': datetime.datetime(2020, 1, 1),
+    'end_date': datetime.datetime(2024, 1, 1),
+
+    # Backtest settings
+    'initial_cash': 100000.0,
+    'commission': 0.001,  # 0.1% per trade
+
+    # Strategy parameters
+    'strategy_params': {
+        'fast_period': 20,
+        'slow_period': 50,
+        'stop_loss_pct': 0.02,  # 2% stop loss
+        'position_size_pct': 0.95,  # Use 95% of available cash
+    },
+}
+
+# Fallback formats for dates datetime.fromisoformat rejects before Python 3.11,
+# e.g. the '2020-01-02 00:00:00.000000-0500' timestamps written by pyarrow
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S.%f%z', '%Y-%m-%d %H:%M:%S%z')
+
+# Relative final value difference tolerated by check_parity; the template
+# stores prices as float32, this entry point parses them as float64
+PARITY_REL_TOL = 1e-6
+
+
+# ==================== STRATEGY DEFINITION ====================
+
+class MovingAverageCrossPyPy(bt.Strategy):
+    """
+    Simple Moving Average Crossover Strategy (pure-Python indicators)
+
+    Same rules as test_template.MovingAverageCrossStrategy, but with
+    Backtrader's own SMA/CrossOver indicators instead of NumPy arrays:
+    - Buy when fast MA crosses above slow MA
+    - Close position when fast MA crosses below slow MA or on stop loss
+    """
+
+    params = (
+        ('fast_period', 20),
+        ('slow_period', 50),
+        ('stop_loss_pct', 0.02),
+        ('position_size_pct', 0.95),
+    )
+
+    def __init__(self):
+        """Initialize strategy indicators and variables."""
+        self.dataclose = self.datas[0].close
+        self.order = None
+        self.buy_price = None
+
+        fast_ma = bt.indicators.SimpleMovingAverage(self.datas[0], period=self.params.fast_period)
+        slow_ma = bt.indicators.SimpleMovingAverage(self.datas[0], period=self.params.slow_period)
+        self.crossover = bt.indicators.CrossOver(fast_ma, slow_ma)
+
+    def notify_order(self, order):
+        """Track entry price and clear the pending order."""
+        if order.status in [order.Submitted, order.Accepted]:
+            return
+
+        if order.status == order.Completed and order.isbuy():
+            self.buy_price = order.executed.price
+
+        self.order = None
+
+    def next(self):
+        """Main strategy logic - called for each bar."""
+        if self.order:
+            return
+
+        close = self.dataclose[0]
+
+        if not self.position:
+            if self.crossover[0] > 0:
+                size = int((self.broker.getcash() * self.params.position_size_pct) / close)
+                if size > 0:
+                    self.order = self.buy(size=size)
+
+        elif self.crossover[0] < 0:
+            self.order = self.sell(size=self.position.size)
+
+        elif self.buy_price:
+            if (close - self.buy_price) / self.buy_price <= -self.params.stop_loss_pct:
+                self.order = self.sell(size=self.position.size)
+
+
+# ==================== DATA LOADING ====================
+
+class ListData(bt.feed.DataBase):
+    """Data feed over a list of (datetime, open, high, low, close, volume) tuples."""
+
+    params = (('rows', None),)
+
+    def start(self):
+        super().start()
+        self._row = 0
+
+    def _load(self):
+        if self._row >= len(self.p.rows):
+            return False
+
+        dt, open_, high, low, close, volume = self.p.rows[self._row]
+        self._row += 1
+
+        self.lines.datetime[0] = bt.date2num(dt)
+        self.lines.open[0] = open_
+        self.lines.high[0] = high
+        self.lines.low[0] = low
+        self.lines.close[0] = close
+        self.lines.volume[0] = volume
+        self.lines.openinterest[0] = 0.0
+        return True
+
+
+def parse_date(text):
+    """
+    Parse an ISO 8601 date or timestamp from the CSV.
+
+    Args:
+        text: Date string, e.g. '2020-01-02' or '2020-01-02 00:00:00-05:00'
+
+    Returns:
+        datetime (timezone-aware if the string has an offset)
+    """
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        # Older interpreters (most PyPy releases) only accept +HH:MM offsets
+        text = text.replace('T', ' ', 1).replace('Z', '+0000')
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.datetime.strptime(text, fmt)
+            except ValueError:
+                pass
+        raise
+
+
+def load_rows(config):
+    """
+    Load price rows with the standard csv module.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        List of (datetime, open, high, low, close, volume) tuples sorted by date
+    """
+    logger.info(f"Loading data from {config['data_file']}")
+
+    symbol = config.get('symbol')
+    start = config.get('start_date')
+    end = config.get('end_date')
+
+    rows = []
+    with open(config['data_file'], newline='') as f:
+        for rec in csv.DictReader(f):
+            if symbol and rec.get('symbol', symbol) != symbol:
+                continue
+
+            # Timezone-aware dates are kept as naive UTC, as in test_template
+            dt = parse_date(rec['date'])
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+            if (start is not None and dt < start) or (end is not None and dt > end):
+                continue
+
+            rows.append((
+                dt, float(rec['open']), float(rec['high']), float(rec['low']),
+                float(rec['close']), float(rec.get('volume') or 0.0)
+            ))
+
+    rows.sort(key=lambda row: row[0])
+    if rows:
+        logger.info(f"Data loaded: {len(rows)} rows from {rows[0][0]} to {rows[-1][0]}")
+    return rows
+
+
+# ==================== BACKTEST EXECUTION ====================
+
+def run_backtest(config):
+    """
+    Execute backtest with given configuration.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Dictionary with final_value, total_return and total_trades
+    """
+    cerebro = bt.Cerebro()
+    cerebro.addstrategy(MovingAverageCrossPyPy, **config['strategy_params'])
+    cerebro.adddata(ListData(rows=load_rows(config)))
+    cerebro.broker.setcash(config['initial_cash'])
+    cerebro.broker.setcommission(commission=config['commission'])
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+
+    start = time.perf_counter()
+    strat = cerebro.run()[0]
+    elapsed = time.perf_counter() - start
+
+    final_value = cerebro.broker.getvalue()
+    total_return = ((final_value - config['initial_cash']) / config['initial_cash']) * 100
+    total_trades = strat.analyzers.trades.get_analysis().get('total', {}).get('total', 0)
+
+    logger.info("=" * 60)
+    logger.info("Backtest Results")
+    logger.info("=" * 60)
+    logger.info(f"Final Portfolio Value: ${final_value:,.2f}")
+    logger.info(f"Total Return: {total_return:.2f}%")
+    logger.info(f"Total Trades: {total_trades}")
+    logger.info(f"Run time: {elapsed:.2f}s")
+    logger.info("=" * 60)
+
+    return {
+        'final_value': final_value,
+        'total_return': total_return,
+        'total_trades': total_trades,
+    }
+
+
+def check_parity(config):
+    """
+    Check this entry point against test_template's 'backtrader' engine.
+
+    Compares the settings this module's CONFIG shares with the template's and
+    the strategy parameter defaults, then runs both engines on config and
+    compares the final value (within PARITY_REL_TOL) and the trade count. Needs CPython, as
+    test_template imports NumPy and pandas.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        True if everything matches
+    """
+    import test_template
+
+    mismatches = [
+        f"CONFIG['{key}']: {CONFIG[key]!r} != {test_template.CONFIG[key]!r}"
+        for key in CONFIG
+        if key in test_template.CONFIG and CONFIG[key] != test_template.CONFIG[key]
+    ]
+    template_params = dict(test_template.MovingAverageCrossStrategy.params._getitems())
+    for name, default in MovingAverageCrossPyPy.params._getitems():
+        if template_params.get(name) != default:
+            mismatches.append(f"param {name}: {default!r} != {template_params.get(name)!r}")
+
+    result = run_backtest(config)
+    reference = test_template.run_backtest(
+        {**test_template.CONFIG, **config, 'engine': 'backtrader',
+         'save_results': False, 'plot_results': False},
+        verbose=False
+    )
+    if not math.isclose(result['final_value'], reference['final_value'], rel_tol=PARITY_REL_TOL):
+        mismatches.append(f"final value: {result['final_value']:,.2f} "
+                          f"!= {reference['final_value']:,.2f}")
+    if result['total_trades'] != reference['total_trades']:
+        mismatches.append(f"total trades: {result['total_trades']} "
+                          f"!= {reference['total_trades']}")
+
+    for mismatch in mismatches:
+        logger.error(f"Parity mismatch with test_template: {mismatch}")
+    if not mismatches:
+        logger.info("Parity check passed: results match test_template's backtrader engine")
+    return not mismatches
+
+
+# ==================== MAIN EXECUTION ====================
+
+if __name__ == '__main__':
+    if '--check-parity' in sys.argv[1:]:
+        sys.exit(0 if check_parity(CONFIG) else 1)
+    run_backtest(CONFIG)
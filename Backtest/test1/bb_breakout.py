@@ -14,13 +14,45 @@ Exit Rules:
 Risk Management:
 - Position sizing based on available capital
 - Stop loss protection
+
+Engines:
+- 'vectorized' (default): bands computed with NumPy/pandas and the trade rules
+  run in a single Numba-compiled pass over the price arrays
+- 'backtrader': the original event-driven BollingerBandBreakout strategy, kept
+  as a reference implementation for cross-checking results
 """
 
 import backtrader as bt
+import numpy as np
+from joblib import Parallel, delayed
 import pandas as pd
-import datetime
+import hashlib
+import itertools
+import json
 import logging
+from dataclasses import astuple, dataclass
 from pathlib import Path
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; kernels then run as plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:  # pyarrow is optional; parsed data is then not cached
+    PYARROW_AVAILABLE = False
+
+# Fast-math flags for the kernels. 'nnan'/'ninf' are left out on purpose: the
+# band warm-up is marked with NaN and the kernels test for it explicitly.
+FASTMATH_FLAGS = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
 
 # Configure logging
 logging.basicConfig(
@@ -39,10 +71,11 @@ CONFIG = {
         '../datasets/data_tables/stocks/NVDA-1d-1000wks-data.csv',
     ],
     'symbol': 'GOOG',  # Primary symbol to test (GOOG or NVDA)
-    'start_date': datetime.datetime(2020, 1, 1),
-    'end_date': datetime.datetime(2024, 1, 1),
+    'start_date': np.datetime64('2020-01-01'),
+    'end_date': np.datetime64('2024-01-01'),
     
     # Backtest settings
+    'engine': 'vectorized',    # 'vectorized' or 'backtrader' (reference implementation)
     'initial_cash': 100000.0,
     'commission': 0.001,  # 0.1% per trade
     'slippage': 0.0005,   # 0.05% slippage
@@ -63,6 +96,14 @@ CONFIG = {
         'bb_dev': [1.5, 2.0, 2.5],          # Test deviations
         'stop_loss_pct': [0.02, 0.03, 0.05], # Test stop losses: 2%, 3%, 5%
     },
+    'n_jobs': -1,  # Parallel workers for the sweep (-1 = all cores)
+    'optimizer': 'grid',  # 'grid' (vectorized engine), 'optuna' or 'vectorbt' (optional packages)
+    'optuna_params': {
+        'n_trials': 50,
+        'bb_period': (10, 40),         # Integer range
+        'bb_dev': (1.0, 3.0),          # Float range
+        'stop_loss_pct': (0.01, 0.08), # Float range
+    },
     
     # Output settings
     'save_results': True,
@@ -87,6 +128,7 @@ class BollingerBandBreakout(bt.Strategy):
         ('stop_loss_pct', 0.03),
         ('position_size_pct', 0.95),
         ('printlog', True),
+        ('use_context_indicators', False),  # RSI / volume SMA, not used by the rules
     )
     
     def __init__(self):
@@ -94,29 +136,34 @@ class BollingerBandBreakout(bt.Strategy):
         # Keep reference to close price
         self.dataclose = self.datas[0].close
         
+        # Resolve the logging flag once; messages are only formatted when enabled
+        self._log_enabled = self.params.printlog
+        
         # Track pending orders and positions
         self.order = None
         self.buy_price = None
         self.buy_comm = None
+        self._stop_px = 0.0  # Stop-loss level, set when the entry fills
         
-        # Add Bollinger Bands indicator
-        self.bbands = bt.indicators.BollingerBands(
-            self.datas[0],
-            period=self.params.bb_period,
-            devfactor=self.params.bb_dev
-        )
+        # Cash only changes on fills, so it is refreshed in notify_order
+        self._cash_cache = self.broker.getcash()
+        self._pos_frac = self.params.position_size_pct
         
-        # Store references for easier access
-        self.top_band = self.bbands.top
-        self.mid_band = self.bbands.mid
-        self.bot_band = self.bbands.bot
+        # Bollinger Bands as NumPy arrays over the preloaded closes, indexed by
+        # bar number in next() instead of going through the lines protocol
+        self._close_np = np.array(self.dataclose.array, dtype=np.float64)
+        mid, sd = compute_bands(self._close_np, self.params.bb_period)
+        self._mid_np = mid
+        self._top_np = mid + self.params.bb_dev * sd
+        self._bot_np = mid - self.params.bb_dev * sd
         
-        # Additional indicators for context
-        self.rsi = bt.indicators.RSI(self.datas[0], period=14)
-        self.volume_sma = bt.indicators.SimpleMovingAverage(
-            self.datas[0].volume, 
-            period=20
-        )
+        # Additional indicators for context (also lengthen the warm-up period)
+        if self.params.use_context_indicators:
+            self.rsi = bt.indicators.RSI(self.datas[0], period=14)
+            self.volume_sma = bt.indicators.SimpleMovingAverage(
+                self.datas[0].volume, 
+                period=20
+            )
         
         logger.info(f"Strategy initialized with bb_period={self.params.bb_period}, "
                    f"bb_dev={self.params.bb_dev}, stop_loss={self.params.stop_loss_pct}")
@@ -127,16 +174,20 @@ class BollingerBandBreakout(bt.Strategy):
             return
         
         if order.status in [order.Completed]:
+            self._cash_cache = self.broker.getcash()
+            
             if order.isbuy():
                 self.buy_price = order.executed.price
                 self.buy_comm = order.executed.comm
-                self.log(
-                    f'BUY EXECUTED - Price: {order.executed.price:.2f}, '
-                    f'Size: {order.executed.size}, '
-                    f'Cost: {order.executed.value:.2f}, '
-                    f'Commission: {order.executed.comm:.2f}'
-                )
-            elif order.issell():
+                self._stop_px = self.buy_price * (1 - self.params.stop_loss_pct)
+                if self._log_enabled:
+                    self.log(
+                        f'BUY EXECUTED - Price: {order.executed.price:.2f}, '
+                        f'Size: {order.executed.size}, '
+                        f'Cost: {order.executed.value:.2f}, '
+                        f'Commission: {order.executed.comm:.2f}'
+                    )
+            elif order.issell() and self._log_enabled:
                 self.log(
                     f'SELL EXECUTED - Price: {order.executed.price:.2f}, '
                     f'Size: {order.executed.size}, '
@@ -145,13 +196,14 @@ class BollingerBandBreakout(bt.Strategy):
                 )
         
         elif order.status in [order.Canceled, order.Margin, order.Rejected]:
-            self.log(f'Order Canceled/Margin/Rejected: {order.status}')
+            if self._log_enabled:
+                self.log(f'Order Canceled/Margin/Rejected: {order.status}')
         
         self.order = None
     
     def notify_trade(self, trade):
         """Receive notification when a trade is closed."""
-        if not trade.isclosed:
+        if not trade.isclosed or not self._log_enabled:
             return
         
         self.log(f'TRADE PROFIT - Gross: {trade.pnl:.2f}, Net: {trade.pnlcomm:.2f}')
@@ -160,8 +212,17 @@ class BollingerBandBreakout(bt.Strategy):
         """
         Main strategy logic - called for each bar.
         """
-        self.log(f'Close: {self.dataclose[0]:.2f}, BB Top: {self.top_band[0]:.2f}, '
-                f'BB Mid: {self.mid_band[0]:.2f}, BB Bot: {self.bot_band[0]:.2f}')
+        i = len(self) - 1
+        
+        # Bands still warming up (no indicator holds next() back any more)
+        if i < self.params.bb_period - 1:
+            return
+        
+        close_px = self._close_np[i]
+        
+        if self._log_enabled:
+            self.log(f'Close: {close_px:.2f}, BB Top: {self._top_np[i]:.2f}, '
+                    f'BB Mid: {self._mid_np[i]:.2f}, BB Bot: {self._bot_np[i]:.2f}')
         
         # Check if an order is pending
         if self.order:
@@ -171,32 +232,32 @@ class BollingerBandBreakout(bt.Strategy):
         if not self.position:
             # Not in market - look for breakout BUY signal
             # Buy when price breaks above upper Bollinger Band
-            if self.dataclose[0] > self.top_band[0]:
+            if close_px > self._top_np[i]:
                 # Additional confirmation: volume above average (optional)
                 # We'll keep it simple for now
                 
-                # Calculate position size
-                cash = self.broker.getcash()
-                size = int((cash * self.params.position_size_pct) / self.dataclose[0])
+                # Calculate position size (whole shares)
+                size = int(self._cash_cache * self._pos_frac // close_px)
                 
                 if size > 0:
-                    self.log(f'BUY SIGNAL - Breakout above BB - Size: {size}')
+                    if self._log_enabled:
+                        self.log(f'BUY SIGNAL - Breakout above BB - Size: {size}')
                     self.order = self.buy(size=size)
         
         else:
             # In market - check exit conditions
             
-            # Exit signal 1: Price crosses below middle Bollinger Band
-            if self.dataclose[0] < self.mid_band[0]:
-                self.log(f'SELL SIGNAL - Price below middle BB')
+            # Exit when price crosses below the middle band or hits the stop loss
+            below_mid = close_px < self._mid_np[i]
+            stopped = close_px <= self._stop_px
+            if below_mid | stopped:
+                if self._log_enabled:
+                    if below_mid:
+                        self.log(f'SELL SIGNAL - Price below middle BB')
+                    else:
+                        loss_pct = (close_px - self.buy_price) / self.buy_price
+                        self.log(f'STOP LOSS TRIGGERED - Loss: {loss_pct*100:.2f}%')
                 self.order = self.sell(size=self.position.size)
-            
-            # Exit signal 2: Stop loss check
-            elif self.buy_price:
-                loss_pct = (self.dataclose[0] - self.buy_price) / self.buy_price
-                if loss_pct <= -self.params.stop_loss_pct:
-                    self.log(f'STOP LOSS TRIGGERED - Loss: {loss_pct*100:.2f}%')
-                    self.order = self.sell(size=self.position.size)
     
     def log(self, txt, dt=None):
         """Logging function for strategy."""
@@ -206,6 +267,9 @@ class BollingerBandBreakout(bt.Strategy):
     
     def stop(self):
         """Called when backtest is finished."""
+        if not self._log_enabled:
+            return
+        
         self.log(
             f'Strategy Finished - BB Period: {self.params.bb_period}, '
             f'BB Dev: {self.params.bb_dev}, '
@@ -217,15 +281,104 @@ class BollingerBandBreakout(bt.Strategy):
 
 # ==================== DATA LOADING ====================
 
-def load_data(config):
+# Columns read from the price CSVs; anything else in the file is skipped
+CSV_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'symbol']
+CSV_DTYPES = {col: 'float32' for col in ['open', 'high', 'low', 'close', 'volume']}
+
+# Parsed CSVs are cached as Parquet under the (git-ignored) datasets cache dir
+DATA_CACHE_DIR = Path(__file__).resolve().parent.parent / 'datasets' / 'cache'
+
+# Parquet footer key recording the source CSV and parsing schema of a cache file
+CACHE_META_KEY = b'bb_breakout_cache'
+
+# Changes whenever the parsed columns or dtypes do, invalidating older cache files
+CACHE_SCHEMA = hashlib.sha1(
+    json.dumps([CSV_COLUMNS, CSV_DTYPES], sort_keys=True).encode()
+).hexdigest()[:12]
+
+
+def _read_cache(cache_path, csv_path):
+    """Return the cached frame for csv_path, or None if missing, stale or foreign."""
+    if not cache_path.exists() or cache_path.stat().st_mtime < csv_path.stat().st_mtime:
+        return None
+    
+    meta = (pq.read_schema(cache_path).metadata or {}).get(CACHE_META_KEY)
+    if meta is None or json.loads(meta) != {'source': str(csv_path), 'schema': CACHE_SCHEMA}:
+        return None
+    
+    logger.info(f"Reading cached data from {cache_path}")
+    return pd.read_parquet(cache_path)
+
+
+def _write_cache(df, cache_path, csv_path):
+    """Write a parsed frame to cache_path, tagged with its source and schema."""
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        CACHE_META_KEY: json.dumps({'source': str(csv_path), 'schema': CACHE_SCHEMA}).encode()
+    })
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, cache_path)
+
+
+def read_price_file(data_file):
     """
-    Load and prepare data for backtesting from local CSV files.
+    Read a price CSV into a date-indexed DataFrame, caching the parsed result.
+    
+    The parsed frame is stored as Parquet in DATA_CACHE_DIR and reused while
+    it is at least as new as the CSV and was written for the same CSV path and
+    CACHE_SCHEMA, so date parsing only happens once per file.
+    
+    Args:
+        data_file: Path to the CSV file
+    
+    Returns:
+        DataFrame indexed by timezone-naive date
+    """
+    csv_path = Path(data_file).resolve()
+    cache_path = DATA_CACHE_DIR / f"{csv_path.stem}.parquet"
+    
+    if PYARROW_AVAILABLE:
+        df = _read_cache(cache_path, csv_path)
+        if df is not None:
+            return df
+    
+    # Read CSV file
+    logger.info(f"Reading data from {data_file}")
+    # The pyarrow engine needs usecols/dtype restricted to columns that exist
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [col for col in CSV_COLUMNS if col in header]
+    dtypes = {col: dtype for col, dtype in CSV_DTYPES.items() if col in header}
+    if PYARROW_AVAILABLE:
+        df = pd.read_csv(csv_path, engine='pyarrow', usecols=usecols, dtype=dtypes)
+    else:
+        logger.warning("pyarrow not available, falling back to the C CSV parser")
+        df = pd.read_csv(csv_path, usecols=usecols, dtype=dtypes)
+    
+    # Parse dates
+    df['date'] = pd.to_datetime(df['date'], utc=True, format='ISO8601', cache=True)
+    # Remove timezone information to avoid compatibility issues
+    df['date'] = df['date'].dt.tz_localize(None)
+    df.set_index('date', inplace=True)
+    
+    if PYARROW_AVAILABLE:
+        try:
+            _write_cache(df, cache_path, csv_path)
+        except OSError as e:
+            logger.warning(f"Could not write data cache {cache_path}: {e}")
+    
+    return df
+
+
+def load_data_df(config):
+    """
+    Load and prepare price data for backtesting from local CSV files.
     
     Args:
         config: Configuration dictionary
     
     Returns:
-        Backtrader data feed
+        DataFrame of OHLCV bars indexed by date
     """
     symbol = config.get('symbol', 'GOOG')
     logger.info(f"Loading data for {symbol} from local CSV files")
@@ -242,75 +395,483 @@ def load_data(config):
         data_file = config['data_files'][0]
         logger.warning(f"Symbol {symbol} not found in file list, using {data_file}")
     
-    # Read CSV file
-    logger.info(f"Reading data from {data_file}")
-    df = pd.read_csv(data_file)
-    
-    # Parse dates
-    df['date'] = pd.to_datetime(df['date'], utc=True)
-    # Remove timezone information to avoid compatibility issues
-    df['date'] = df['date'].dt.tz_localize(None)
-    df.set_index('date', inplace=True)
+    df = read_price_file(data_file)
     
     # Filter for the symbol (in case multiple symbols in one file)
     if 'symbol' in df.columns:
         df = df[df['symbol'] == symbol].copy()
         logger.info(f"Filtered for symbol: {symbol}")
     
-    # Filter date range
-    if config.get('start_date'):
-        df = df[df.index >= config['start_date']]
-    if config.get('end_date'):
-
-        df = df[df.index <= config['end_date']]
+    # Filter date range (binary search on the sorted index, inclusive bounds)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    # Bounds are cast to the index unit so the search compares raw int64 values
+    dates = df.index.values
+    lo, hi = 0, len(df)
+    if config.get('start_date') is not None:
+        lo = dates.searchsorted(np.datetime64(config['start_date']).astype(dates.dtype), side='left')
+    if config.get('end_date') is not None:
+        hi = dates.searchsorted(np.datetime64(config['end_date']).astype(dates.dtype), side='right')
+    df = df.iloc[lo:hi]
     
     logger.info(f"Data loaded: {len(df)} rows from {df.index.min()} to {df.index.max()}")
     
-    # Create Backtrader data feed
-    data = bt.feeds.PandasData(dataname=df)
+    return df
+
+
+def load_data(config):
+    """
+    Load data for backtesting as a Backtrader data feed.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        Backtrader data feed
+    """
+    return bt.feeds.PandasData(dataname=load_data_df(config))
+
+
+# ==================== VECTORIZED ENGINE ====================
+
+@njit('Tuple((f8, i8, i8, i8))(f8[::1], f8[::1], f8[::1], f8[::1], f8, f8, f8, f8, f8, '
+      'f8[::1], f8[:, ::1])',
+      cache=True, nogil=True, fastmath=FASTMATH_FLAGS, boundscheck=False)
+def _simulate(open_, close, mid, sd, bb_dev, stop_loss_pct, position_size_pct,
+              init_cash, commission, equity, trades):
+    """
+    Run the BollingerBandBreakout rules in one pass over the price arrays.
+    
+    Mirrors the Backtrader strategy bar for bar: signals are evaluated on the
+    close, market orders fill at the next bar's open, a buy that the cash
+    cannot cover at that open is rejected (Backtrader's Margin status), and
+    commission is charged as a fraction of traded value on both legs.
+    
+    The equity curve and trade rows are only written when the output arrays
+    are non-empty; otherwise just scalar state is tracked.
+    
+    Returns:
+        Tuple of (final value, closed trades, winning trades, open position size)
+    """
+    n = close.shape[0]
+    record = equity.shape[0] > 0
+    n_trades = 0
+    n_won = 0
+    
+    cash = init_cash
+    position = 0
+    entry_idx = -1
+    entry_price = 0.0
+    entry_comm = 0.0
+    stop_px = 0.0
+    pending = 0  # > 0: buy size submitted last bar, -1: close submitted last bar
+    
+    for i in range(n):
+        # Fill the order submitted on the previous bar at this bar's open
+        if pending > 0:
+            cost = pending * open_[i]
+            comm = cost * commission
+            if cost + comm <= cash:
+                cash -= cost + comm
+                position = pending
+                entry_idx = i
+                entry_price = open_[i]
+                entry_comm = comm
+                stop_px = entry_price * (1.0 - stop_loss_pct)
+        elif pending < 0:
+            proceeds = position * open_[i]
+            comm = proceeds * commission
+            cash += proceeds - comm
+            gross = position * (open_[i] - entry_price)
+            net = gross - entry_comm - comm
+            if net >= 0:
+                n_won += 1
+            if record:
+                trades[n_trades, 0] = entry_idx
+                trades[n_trades, 1] = i
+                trades[n_trades, 2] = position
+                trades[n_trades, 3] = entry_price
+                trades[n_trades, 4] = open_[i]
+                trades[n_trades, 5] = gross
+                trades[n_trades, 6] = net
+            n_trades += 1
+            position = 0
+        pending = 0
+        
+        if record:
+            equity[i] = cash + position * close[i]
+        
+        # Bands still warming up
+        if np.isnan(mid[i]):
+            continue
+        
+        if position == 0:
+            # Breakout above the upper band
+            if close[i] > mid[i] + bb_dev * sd[i]:
+                size = int(cash * position_size_pct // close[i])
+                if size > 0:
+                    pending = size
+        else:
+            # Exit below the middle band or on stop loss
+            if (close[i] < mid[i]) | (close[i] <= stop_px):
+                pending = -1
+    
+    final_value = cash + position * close[n - 1] if n > 0 else cash
+    return final_value, n_trades, n_won, position
+
+
+@njit('Tuple((f8, i8, i8, i8))(f8[::1], f8[::1], f8[::1], f8[::1], f8, f8, f8, f8, f8)',
+      cache=True, nogil=True, fastmath=FASTMATH_FLAGS, boundscheck=False)
+def run_fast(open_, close, mid, sd, bb_dev, stop_loss_pct, position_size_pct,
+             init_cash, commission):
+    """
+    Simulate without materializing the equity curve or trade list.
+    
+    Returns:
+        Tuple of (final value, closed trades, winning trades, open position size)
+    """
+    return _simulate(open_, close, mid, sd, bb_dev, stop_loss_pct, position_size_pct,
+                     init_cash, commission, np.empty(0), np.empty((0, 7)))
+
+
+@njit('Tuple((f8[::1], f8[:, ::1], i8))(f8[::1], f8[::1], f8[::1], f8[::1], f8, f8, f8, f8, f8)',
+      cache=True, nogil=True, fastmath=FASTMATH_FLAGS, boundscheck=False)
+def run_with_curve(open_, close, mid, sd, bb_dev, stop_loss_pct, position_size_pct,
+                   init_cash, commission):
+    """
+    Simulate and record the per-bar equity curve and every closed trade.
+    
+    Returns:
+        Tuple of (equity curve, closed trades array, size of any open position).
+        Each trade row is [entry_idx, exit_idx, size, entry_price, exit_price,
+        gross_pnl, net_pnl].
+    """
+    n = close.shape[0]
+    equity = np.empty(n)
+    trades = np.empty((n, 7))
+    _, n_trades, _, position = _simulate(open_, close, mid, sd, bb_dev, stop_loss_pct,
+                                         position_size_pct, init_cash, commission,
+                                         equity, trades)
+    return equity, trades[:n_trades], position
+
+
+@njit('Tuple((f8[::1], f8[::1]))(f8[::1], i8)',
+      cache=True, nogil=True, fastmath=FASTMATH_FLAGS, boundscheck=False)
+def bollinger_incremental(close, period):
+    """
+    Rolling mean and population standard deviation in a single O(N) pass.
+    
+    Keeps a running sum and sum of squares, adding the newest close and
+    removing the one that leaves the window, so the cost does not grow with
+    the period.
+    
+    Returns:
+        Tuple of (mid, sd) arrays, NaN for the first period - 1 bars
+    """
+    n = close.shape[0]
+    mid = np.full(n, np.nan)
+    sd = np.full(n, np.nan)
+    total = 0.0
+    total_sq = 0.0
+    
+    for i in range(n):
+        total += close[i]
+        total_sq += close[i] * close[i]
+        if i >= period:
+            total -= close[i - period]
+            total_sq -= close[i - period] * close[i - period]
+        if i >= period - 1:
+            mean = total / period
+            # Cancellation can leave a tiny negative variance on flat windows
+            var = max(total_sq / period - mean * mean, 0.0)
+            mid[i] = mean
+            sd[i] = np.sqrt(var)
+    
+    return mid, sd
+
+
+def compute_bands(close, bb_period):
+    """
+    Compute the Bollinger middle band and population standard deviation.
+    
+    Uses the compiled incremental pass when numba is installed; otherwise a
+    strided 2D window view reduced in C, since the incremental loop would
+    run as interpreted Python.
+    
+    Args:
+        close: Series or array of close prices
+        bb_period: Rolling window length
+    
+    Returns:
+        Tuple of (mid, sd) NumPy arrays, NaN during warm-up
+    """
+    close_np = np.ascontiguousarray(close, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return bollinger_incremental(close_np, bb_period)
+    
+    mid = np.full(len(close_np), np.nan)
+    sd = np.full(len(close_np), np.nan)
+    if len(close_np) >= bb_period:
+        # Window i covers bars i .. i + period - 1, so results start at period - 1
+        windows = sliding_window_view(close_np, bb_period)
+        mid[bb_period - 1:] = windows.mean(axis=1)
+        sd[bb_period - 1:] = windows.std(axis=1)
+    return mid, sd
+
+
+def _price_arrays(df):
+    """Open and close prices as contiguous float64 arrays for the kernels."""
+    return (np.ascontiguousarray(df['open'], dtype=np.float64),
+            np.ascontiguousarray(df['close'], dtype=np.float64))
+
+
+def vectorized_backtest(df, bb_period, bb_dev, stop_loss_pct, init_cash, commission,
+                        position_size_pct=0.95, bands=None):
+    """
+    Backtest the Bollinger Band breakout rules without the Backtrader event loop.
+    
+    Args:
+        df: OHLCV DataFrame indexed by date (see load_data_df)
+        bb_period: Bollinger Band period
+        bb_dev: Standard deviations for the upper band
+        stop_loss_pct: Stop loss as a fraction of entry price
+        init_cash: Starting cash
+        commission: Commission as a fraction of traded value
+        position_size_pct: Fraction of cash committed per entry
+        bands: Optional precomputed (mid, sd) for bb_period, see compute_bands
+    
+    Returns:
+        Dictionary with the equity curve, closed trades and open position size
+    """
+    close = df['close']
+    mid, sd = bands if bands is not None else compute_bands(close, bb_period)
+    
+    equity, trades, open_size = run_with_curve(
+        *_price_arrays(df),
+        mid,
+        sd,
+        bb_dev,
+        stop_loss_pct,
+        position_size_pct,
+        init_cash,
+        commission
+    )
+    
+    return {
+        'params': {
+            'bb_period': bb_period,
+            'bb_dev': bb_dev,
+            'stop_loss_pct': stop_loss_pct,
+        },
+        'dates': df.index,
+        'equity': equity,
+        'trades': trades,
+        'open_size': open_size,
+    }
+
+
+def compute_metrics(result, config):
+    """
+    Compute the summary statistics reported by the Backtrader analyzers.
+    
+    Sharpe (yearly returns, 2% risk-free rate), max drawdown, annualized return
+    (252 periods per year), SQN and trade statistics follow the definitions of
+    the corresponding Backtrader analyzers so both engines report comparable
+    numbers.
+    
+    Args:
+        result: Output of vectorized_backtest
+        config: Configuration dictionary
+    
+    Returns:
+        Dictionary of performance metrics
+    """
+    equity = result['equity']
+    initial_cash = config['initial_cash']
+    final_value = equity[-1] if len(equity) else initial_cash
+    
+    sharpe = None
+    max_dd = 0.0
+    annual_return = 0.0
+    if len(equity):
+        # Sharpe ratio over calendar-year returns
+        yearly_values = pd.Series(equity, index=result['dates']).groupby(result['dates'].year).last()
+        yearly_returns = np.diff(np.concatenate(([initial_cash], yearly_values.to_numpy()))) \
+            / np.concatenate(([initial_cash], yearly_values.to_numpy()[:-1]))
+        excess = yearly_returns - 0.02
+        sharpe = excess.mean() / excess.std() if len(excess) > 1 and excess.std() > 0 else None
+        
+        # Maximum drawdown (percent)
+        peak = np.maximum.accumulate(equity)
+        max_dd = ((peak - equity) / peak).max() * 100
+        
+        # Annualized (normalized) return
+        annual_return = (np.exp(np.log(final_value / initial_cash) / len(equity) * 252) - 1) * 100
+    
+    # Trade statistics (an open position counts towards the total only)
+    pnl = result['trades'][:, 6]
+    won = pnl[pnl >= 0]
+    lost = pnl[pnl < 0]
+    sqn = np.sqrt(len(pnl)) * pnl.mean() / pnl.std() if len(pnl) > 1 and pnl.std() > 0 else None
+    
+    return {
+        'final_value': final_value,
+        'total_return': (final_value - initial_cash) / initial_cash * 100,
+        'sharpe': sharpe,
+        'max_dd': max_dd,
+        'annual_return': annual_return,
+        'sqn': sqn,
+        'total_trades': len(pnl) + (1 if result['open_size'] else 0),
+        'won_trades': len(won),
+        'lost_trades': len(lost),
+        'avg_win': won.mean() if len(won) else 0,
+        'avg_loss': lost.mean() if len(lost) else 0,
+        'gross_profit': won.sum(),
+        'gross_loss': abs(lost.sum()),
+    }
+
+
+def analyzer_metrics(cerebro, strat, config):
+    """
+    Collect the same metrics as compute_metrics from Backtrader analyzers.
+    
+    Args:
+        cerebro: Cerebro instance after the run
+        strat: Strategy instance with analyzers attached
+        config: Configuration dictionary
+    
+    Returns:
+        Dictionary of performance metrics
+    """
+    final_value = cerebro.broker.getvalue()
+    trades = strat.analyzers.trades.get_analysis()
     
-    return data
+    return {
+        'final_value': final_value,
+        'total_return': ((final_value - config['initial_cash']) / config['initial_cash']) * 100,
+        'sharpe': strat.analyzers.sharpe.get_analysis().get('sharperatio', None),
+        'max_dd': strat.analyzers.drawdown.get_analysis().get('max', {}).get('drawdown', 0),
+        'annual_return': strat.analyzers.returns.get_analysis().get('rnorm100', 0),
+        'sqn': strat.analyzers.sqn.get_analysis().get('sqn', None),
+        'total_trades': trades.get('total', {}).get('total', 0),
+        'won_trades': trades.get('won', {}).get('total', 0),
+        'lost_trades': trades.get('lost', {}).get('total', 0),
+        'avg_win': trades.get('won', {}).get('pnl', {}).get('average', 0),
+        'avg_loss': trades.get('lost', {}).get('pnl', {}).get('average', 0),
+        'gross_profit': trades.get('won', {}).get('pnl', {}).get('total', 0),
+        'gross_loss': abs(trades.get('lost', {}).get('pnl', {}).get('total', 0)),
+    }
 
 
 # ==================== BACKTEST EXECUTION ====================
 
-def run_backtest(config, optimize=False):
+# Number of ranked optimization results that are printed (and fully scored)
+TOP_N_RESULTS = 10
+
+@dataclass(slots=True)
+class TradeResult:
+    """Summary of one optimization run, used to rank parameter combinations."""
+    bb_period: int
+    bb_dev: float
+    stop_loss_pct: float
+    final_value: float
+    return_pct: float
+    sharpe: float | None
+    max_dd: float | None
+    total_trades: int
+    win_rate: float
+
+
+# Ranked optimization results; parameters stay float64 so runs can be replayed
+OPT_RESULT_DTYPE = np.dtype([
+    ('bb_period', 'i4'),
+    ('bb_dev', 'f8'),
+    ('stop_loss_pct', 'f8'),
+    ('final_value', 'f8'),
+    ('return_pct', 'f8'),
+    ('sharpe', 'f8'),
+    ('max_dd', 'f4'),
+    ('total_trades', 'i4'),
+    ('win_rate', 'f4'),
+])
+
+
+def rank_results(opt_results):
+    """
+    Pack TradeResult records into a structured array sorted by return.
+    
+    Args:
+        opt_results: Iterable of TradeResult
+    
+    Returns:
+        Structured array with OPT_RESULT_DTYPE, best return first. Missing
+        Sharpe/drawdown values are stored as NaN.
+    """
+    ranked = np.array(
+        [tuple(np.nan if v is None else v for v in astuple(res)) for res in opt_results],
+        dtype=OPT_RESULT_DTYPE
+    )
+    return ranked[np.argsort(-ranked['return_pct'], kind='stable')]
+
+
+def run_backtest(config, data=None, optimize=False):
     """
     Execute backtest with given configuration.
     
+    Single runs use the engine selected by config['engine']; optimization always
+    runs on the vectorized engine.
+    
     Args:
         config: Configuration dictionary
+        data: Optional DataFrame from load_data_df; loaded from config if None
         optimize: If True, run optimization instead of single backtest
     
     Returns:
-        Cerebro instance with results
+        Vectorized result dictionary, (cerebro, results) for the backtrader
+        engine, or the ranked list of optimization results
     """
     logger.info("=" * 80)
     logger.info(f"Starting Backtest - {'OPTIMIZATION MODE' if optimize else 'SINGLE RUN MODE'}")
     logger.info("=" * 80)
     
+    if data is None:
+        data = load_data_df(config)
+    
+    if optimize:
+        return run_optimization(config, data)
+    
+    if config.get('engine', 'vectorized') == 'vectorized':
+        logger.info(f"Initial Portfolio Value: ${config['initial_cash']:,.2f}")
+        logger.info(f"Commission: {config['commission']*100}%")
+        
+        params = config['strategy_params']
+        result = vectorized_backtest(
+            data,
+            params['bb_period'],
+            params['bb_dev'],
+            params['stop_loss_pct'],
+            config['initial_cash'],
+            config['commission'],
+            position_size_pct=params['position_size_pct']
+        )
+        print_results(compute_metrics(result, config), config)
+        
+        if config.get('plot_results', False):
+            logger.warning("Plotting is only available with engine='backtrader'")
+        
+        return result
+    
     # Create cerebro instance
     cerebro = bt.Cerebro()
     
     # Add strategy
-    if optimize:
-        logger.info("Running parameter optimization...")
-        cerebro.optstrategy(
-            BollingerBandBreakout,
-            bb_period=config['optimization_params']['bb_period'],
-            bb_dev=config['optimization_params']['bb_dev'],
-            stop_loss_pct=config['optimization_params']['stop_loss_pct'],
-            printlog=False  # Disable logging during optimization
-        )
-    else:
-        cerebro.addstrategy(
-            BollingerBandBreakout,
-            **config['strategy_params']
-        )
+    cerebro.addstrategy(
+        BollingerBandBreakout,
+        **config['strategy_params']
+    )
     
-    # Load and add data
-    data = load_data(config)
-    cerebro.adddata(data)
+    # Add data (a fresh feed per run, Cerebro consumes it)
+    cerebro.adddata(bt.feeds.PandasData(dataname=data))
     
     # Set initial cash
     cerebro.broker.setcash(config['initial_cash'])
@@ -331,30 +892,260 @@ def run_backtest(config, optimize=False):
     logger.info("\nRunning backtest...\n")
     results = cerebro.run()
     
-    if not optimize:
-        # Print detailed results for single run
-        print_results(cerebro, results[0], config)
-        
-        # Plot if requested
-        if config.get('plot_results', False):
-            logger.info("\nGenerating plots...")
-            cerebro.plot(style='candlestick', barup='green', bardown='red')
-    else:
-        # Print optimization results
-        print_optimization_results(results, config)
+    # Print detailed results for single run
+    print_results(analyzer_metrics(cerebro, results[0], config), config)
+    
+    # Plot if requested
+    if config.get('plot_results', False):
+        logger.info("\nGenerating plots...")
+        cerebro.plot(style='candlestick', barup='green', bardown='red')
     
     return cerebro, results
 
 
-def print_results(cerebro, strat, config):
+def _run_combination(prices, bb_period, bb_dev, stop_loss_pct, config, band_cache):
+    """
+    Backtest one parameter combination and summarize it for ranking.
+    
+    Uses the scalar-only kernel: ranking needs the final value and trade
+    counts, not the equity curve (see _score_top_results).
+    """
+    mid, sd = band_cache[bb_period]
+    final_value, closed_trades, won_trades, open_size = run_fast(
+        *prices,
+        mid,
+        sd,
+        bb_dev,
+        stop_loss_pct,
+        config['strategy_params']['position_size_pct'],
+        config['initial_cash'],
+        config['commission']
+    )
+    total_trades = closed_trades + (1 if open_size else 0)
+    
+    return TradeResult(
+        bb_period=bb_period,
+        bb_dev=bb_dev,
+        stop_loss_pct=stop_loss_pct,
+        final_value=final_value,
+        return_pct=(final_value - config['initial_cash']) / config['initial_cash'] * 100,
+        sharpe=None,
+        max_dd=None,
+        total_trades=total_trades,
+        win_rate=(won_trades / total_trades * 100) if total_trades > 0 else 0
+    )
+
+
+def run_optimization(config, df):
+    """
+    Run the parameter grid on the vectorized engine in parallel.
+    
+    The data is loaded once and shared by all workers, and the rolling mean and
+    standard deviation are computed once per bb_period: bb_dev and
+    stop_loss_pct only change how the bands are used. Threads are used rather
+    than processes since the kernel releases the GIL, which avoids pickling
+    the price data and process start-up costs.
+    
+    Args:
+        config: Configuration dictionary
+        df: Price DataFrame from load_data_df
+    
+    Returns:
+        Structured array of results (OPT_RESULT_DTYPE), best return first
+    """
+    logger.info("Running parameter optimization...")
+    optimizer = config.get('optimizer', 'grid')
+    if optimizer == 'vectorbt':
+        return run_optimization_vectorbt(config, df)
+    if optimizer == 'optuna':
+        return run_optimization_optuna(config, df)
+    
+    opt_params = config['optimization_params']
+    
+    params = list(itertools.product(
+        opt_params['bb_period'], opt_params['bb_dev'], opt_params['stop_loss_pct']
+    ))
+    logger.info(f"Testing {len(params)} parameter combinations")
+    
+    prices = _price_arrays(df)
+    band_cache = {p: compute_bands(df['close'], p) for p in opt_params['bb_period']}
+    
+    opt_results = Parallel(n_jobs=config.get('n_jobs', -1), prefer='threads')(
+        delayed(_run_combination)(prices, *p, config, band_cache) for p in params
+    )
+    
+    ranked = rank_results(opt_results)
+    _score_top_results(ranked, df, config, band_cache)
+    print_optimization_results(ranked, config)
+    
+    return ranked
+
+
+def _score_top_results(ranked, df, config, band_cache):
+    """
+    Fill in Sharpe/drawdown for the top rows of a ranked results array.
+    
+    Ranking only needs the return, so the equity-curve statistics are computed
+    by re-running just the top TOP_N_RESULTS combinations.
+    """
+    for row in ranked[:TOP_N_RESULTS]:
+        bb_period = int(row['bb_period'])
+        result = vectorized_backtest(
+            df,
+            bb_period,
+            float(row['bb_dev']),
+            float(row['stop_loss_pct']),
+            config['initial_cash'],
+            config['commission'],
+            position_size_pct=config['strategy_params']['position_size_pct'],
+            bands=band_cache[bb_period]
+        )
+        metrics = compute_metrics(result, config)
+        row['sharpe'] = np.nan if metrics['sharpe'] is None else metrics['sharpe']
+        row['max_dd'] = metrics['max_dd']
+
+
+def run_optimization_optuna(config, df):
+    """
+    Search the parameter space with Optuna's TPE sampler instead of a grid.
+    
+    Parameters are sampled from the ranges in config['optuna_params'], which
+    may be much wider than the grid since the cost is set by n_trials rather
+    than by the number of combinations. Each trial runs the vectorized engine
+    and maximizes total return.
+    
+    Args:
+        config: Configuration dictionary
+        df: Price DataFrame from load_data_df
+    
+    Returns:
+        Structured array of all trials (OPT_RESULT_DTYPE), best return first
+    """
+    try:
+        import optuna
+    except ImportError as e:
+        raise ImportError("optimizer='optuna' requires the optuna package") from e
+    
+    space = config['optuna_params']
+    prices = _price_arrays(df)
+    band_cache = {}
+    opt_results = []
+    
+    def objective(trial):
+        bb_period = trial.suggest_int('bb_period', *space['bb_period'])
+        bb_dev = trial.suggest_float('bb_dev', *space['bb_dev'])
+        stop_loss_pct = trial.suggest_float('stop_loss_pct', *space['stop_loss_pct'])
+        
+        if bb_period not in band_cache:
+            band_cache[bb_period] = compute_bands(df['close'], bb_period)
+        
+        res = _run_combination(prices, bb_period, bb_dev, stop_loss_pct, config, band_cache)
+        opt_results.append(res)
+        return res.return_pct
+    
+    logger.info(f"Running {space['n_trials']} Optuna trials")
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction='maximize', sampler=optuna.samplers.TPESampler())
+    study.optimize(objective, n_trials=space['n_trials'], n_jobs=config.get('n_jobs', -1))
+    
+    ranked = rank_results(opt_results)
+    _score_top_results(ranked, df, config, band_cache)
+    print_optimization_results(ranked, config)
+    
+    return ranked
+
+
+def run_optimization_vectorbt(config, df):
+    """
+    Run the parameter grid as a single broadcast VectorBT portfolio.
+    
+    Every (bb_period, bb_dev, stop_loss_pct) combination becomes one column of
+    the signal matrices and is simulated in one compiled pass. VectorBT fills
+    at the signal bar's close and triggers stops on bar prices, so results
+    approximate rather than reproduce the vectorized/Backtrader engines.
+    
+    Args:
+        config: Configuration dictionary
+        df: Price DataFrame from load_data_df
+    
+    Returns:
+        Structured array of results (OPT_RESULT_DTYPE), best return first
+    """
+    try:
+        import vectorbt as vbt
+    except ImportError as e:
+        raise ImportError("optimizer='vectorbt' requires the vectorbt package") from e
+    
+    opt_params = config['optimization_params']
+    close = df['close']
+    
+    bb = vbt.BBANDS.run(
+        close,
+        window=list(opt_params['bb_period']),
+        alpha=list(opt_params['bb_dev']),
+        param_product=True
+    )
+    entries = bb.upper.lt(close, axis=0)
+    exits = bb.middle.gt(close, axis=0)
+    
+    # Add stop loss as the outer column level
+    stop_losses = pd.Index(list(opt_params['stop_loss_pct']), name='sl_stop')
+    entries = entries.vbt.tile(len(stop_losses), keys=stop_losses)
+    exits = exits.vbt.tile(len(stop_losses), keys=stop_losses)
+    sl_stop = pd.DataFrame(
+        np.broadcast_to(np.repeat(stop_losses.to_numpy(), bb.upper.shape[1]), entries.shape),
+        index=entries.index,
+        columns=entries.columns
+    )
+    
+    pf = vbt.Portfolio.from_signals(
+        close,
+        entries,
+        exits,
+        sl_stop=sl_stop,
+        size=config['strategy_params']['position_size_pct'],
+        size_type='percent',
+        fees=config['commission'],
+        init_cash=config['initial_cash'],
+        freq='1D'
+    )
+    
+    total_return = pf.total_return()
+    sharpe = pf.sharpe_ratio()
+    max_dd = pf.max_drawdown()
+    total_trades = pf.trades.count()
+    win_rate = pf.trades.win_rate()
+    
+    opt_results = []
+    for col in total_return.index:
+        stop_loss_pct, bb_period, bb_dev = col
+        opt_results.append(TradeResult(
+            bb_period=int(bb_period),
+            bb_dev=float(bb_dev),
+            stop_loss_pct=float(stop_loss_pct),
+            final_value=config['initial_cash'] * (1 + total_return[col]),
+            return_pct=total_return[col] * 100,
+            sharpe=sharpe[col],
+            max_dd=abs(max_dd[col]) * 100,
+            total_trades=int(total_trades[col]),
+            win_rate=0 if np.isnan(win_rate[col]) else win_rate[col] * 100
+        ))
+    
+    ranked = rank_results(opt_results)
+    print_optimization_results(ranked, config)
+    
+    return ranked
+
+
+def print_results(metrics, config):
     """Print detailed backtest results."""
     logger.info("=" * 80)
     logger.info("BACKTEST RESULTS")
     logger.info("=" * 80)
     
     # Basic performance
-    final_value = cerebro.broker.getvalue()
-    total_return = ((final_value - config['initial_cash']) / config['initial_cash']) * 100
+    final_value = metrics['final_value']
+    total_return = metrics['total_return']
     
     print(f"\n{'='*80}")
     print(f"FINAL RESULTS")
@@ -365,30 +1156,23 @@ def print_results(cerebro, strat, config):
     print(f"Profit/Loss:              ${final_value - config['initial_cash']:,.2f}")
     
     # Sharpe Ratio
-    sharpe = strat.analyzers.sharpe.get_analysis()
-    sharpe_ratio = sharpe.get('sharperatio', None)
+    sharpe_ratio = metrics['sharpe']
     print(f"\nSharpe Ratio:             {sharpe_ratio if sharpe_ratio else 'N/A'}")
     
     # Drawdown
-    drawdown = strat.analyzers.drawdown.get_analysis()
-    max_dd = drawdown.get('max', {}).get('drawdown', 0)
-    print(f"Max Drawdown:             {max_dd:.2f}%")
+    print(f"Max Drawdown:             {metrics['max_dd']:.2f}%")
     
     # Returns
-    returns = strat.analyzers.returns.get_analysis()
-    annual_return = returns.get('rnorm100', 0)
-    print(f"Annualized Return:        {annual_return:.2f}%")
+    print(f"Annualized Return:        {metrics['annual_return']:.2f}%")
     
     # SQN (System Quality Number)
-    sqn_analysis = strat.analyzers.sqn.get_analysis()
-    sqn = sqn_analysis.get('sqn', None)
+    sqn = metrics['sqn']
     print(f"SQN (System Quality):     {sqn if sqn else 'N/A'}")
     
     # Trade statistics
-    trades = strat.analyzers.trades.get_analysis()
-    total_trades = trades.get('total', {}).get('total', 0)
-    won_trades = trades.get('won', {}).get('total', 0)
-    lost_trades = trades.get('lost', {}).get('total', 0)
+    total_trades = metrics['total_trades']
+    won_trades = metrics['won_trades']
+    lost_trades = metrics['lost_trades']
     
     print(f"\n{'='*80}")
     print(f"TRADE STATISTICS")
@@ -403,94 +1187,51 @@ def print_results(cerebro, strat, config):
         
         # Profit/Loss details
         if won_trades > 0:
-            avg_win = trades.get('won', {}).get('pnl', {}).get('average', 0)
-            print(f"Average Win:              ${avg_win:.2f}")
+            print(f"Average Win:              ${metrics['avg_win']:.2f}")
         
         if lost_trades > 0:
-            avg_loss = trades.get('lost', {}).get('pnl', {}).get('average', 0)
-            print(f"Average Loss:             ${avg_loss:.2f}")
+            print(f"Average Loss:             ${metrics['avg_loss']:.2f}")
         
         # Profit factor
-        gross_profit = trades.get('won', {}).get('pnl', {}).get('total', 0)
-        gross_loss = abs(trades.get('lost', {}).get('pnl', {}).get('total', 0))
+        gross_loss = metrics['gross_loss']
         if gross_loss > 0:
-            profit_factor = gross_profit / gross_loss
+            profit_factor = metrics['gross_profit'] / gross_loss
             print(f"Profit Factor:            {profit_factor:.2f}")
     
     print(f"{'='*80}\n")
 
 
-def print_optimization_results(results, config):
-    """Print optimization results sorted by final portfolio value."""
+def print_optimization_results(ranked, config):
+    """Print ranked optimization results (see rank_results)."""
     logger.info("=" * 80)
     logger.info("OPTIMIZATION RESULTS")
     logger.info("=" * 80)
     
-    # Collect results
-    opt_results = []
-    for result in results:
-        strat = result[0]
-        params = {
-            'bb_period': strat.params.bb_period,
-            'bb_dev': strat.params.bb_dev,
-            'stop_loss_pct': strat.params.stop_loss_pct,
-        }
-        
-        # Extract returns from analyzer instead of accessing broker
-        returns_analyzer = strat.analyzers.returns.get_analysis()
-        total_return = returns_analyzer.get('rtot', 0) * 100  # Convert to percentage
-        final_value = config['initial_cash'] * (1 + returns_analyzer.get('rtot', 0))
-        
-        # Get analyzer results
-        sharpe = strat.analyzers.sharpe.get_analysis()
-        sharpe_ratio = sharpe.get('sharperatio', None)
-        
-        drawdown = strat.analyzers.drawdown.get_analysis()
-        max_dd = drawdown.get('max', {}).get('drawdown', 0)
-        
-        trades = strat.analyzers.trades.get_analysis()
-        total_trades = trades.get('total', {}).get('total', 0)
-        won_trades = trades.get('won', {}).get('total', 0)
-        win_rate = (won_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        opt_results.append({
-            'params': params,
-            'final_value': final_value,
-            'return_pct': total_return,
-            'sharpe': sharpe_ratio,
-            'max_dd': max_dd,
-            'total_trades': total_trades,
-            'win_rate': win_rate
-        })
-    
-    # Sort by return percentage
-    opt_results.sort(key=lambda x: x['return_pct'], reverse=True)
-    
-    # Print top 10 results
+    # Print top results
     print(f"\n{'='*80}")
-    print(f"TOP 10 PARAMETER COMBINATIONS (Sorted by Return %)")
+    print(f"TOP {TOP_N_RESULTS} PARAMETER COMBINATIONS (Sorted by Return %)")
     print(f"{'='*80}\n")
     
-    for i, res in enumerate(opt_results[:10], 1):
-        params = res['params']
+    for i, res in enumerate(ranked[:TOP_N_RESULTS], 1):
+        sharpe = res['sharpe']
         print(f"Rank #{i}")
-        print(f"  Parameters: BB Period={params['bb_period']}, BB Dev={params['bb_dev']}, "
-              f"Stop Loss={params['stop_loss_pct']*100:.1f}%")
+        print(f"  Parameters: BB Period={res['bb_period']}, BB Dev={res['bb_dev']:g}, "
+              f"Stop Loss={res['stop_loss_pct']*100:.1f}%")
         print(f"  Final Value: ${res['final_value']:,.2f}")
         print(f"  Return: {res['return_pct']:.2f}%")
-        print(f"  Sharpe Ratio: {res['sharpe'] if res['sharpe'] else 'N/A'}")
+        print(f"  Sharpe Ratio: {sharpe if sharpe and not np.isnan(sharpe) else 'N/A'}")
         print(f"  Max Drawdown: {res['max_dd']:.2f}%")
         print(f"  Total Trades: {res['total_trades']}, Win Rate: {res['win_rate']:.2f}%")
         print()
     
     # Print best parameters
-    best = opt_results[0]
+    best = ranked[0]
     print(f"{'='*80}")
     print(f"RECOMMENDED PARAMETERS")
     print(f"{'='*80}")
-    print(f"BB Period:      {best['params']['bb_period']}")
-    print(f"BB Deviation:   {best['params']['bb_dev']}")
-    print(f"Stop Loss:      {best['params']['stop_loss_pct']*100:.1f}%")
+    print(f"BB Period:      {best['bb_period']}")
+    print(f"BB Deviation:   {best['bb_dev']:g}")
+    print(f"Stop Loss:      {best['stop_loss_pct']*100:.1f}%")
     print(f"{'='*80}\n")
 
 
@@ -498,12 +1239,15 @@ def print_optimization_results(results, config):
 
 if __name__ == '__main__':
     try:
+        # Load the data once for both steps
+        data_df = load_data_df(CONFIG)
+        
         # Step 1: Run initial backtest with default parameters
         print("\n" + "="*80)
         print("STEP 1: RUNNING BACKTEST WITH DEFAULT PARAMETERS")
         print("="*80 + "\n")
         
-        cerebro, results = run_backtest(CONFIG, optimize=False)
+        run_backtest(CONFIG, data=data_df, optimize=False)
         logger.info("\n✓ Initial backtest completed successfully!\n")
         
         # Step 2: Run optimization
@@ -513,7 +1257,7 @@ if __name__ == '__main__':
         
         CONFIG['optimize'] = True
         CONFIG['plot_results'] = False  # Disable plotting during optimization
-        cerebro_opt, results_opt = run_backtest(CONFIG, optimize=True)
+        run_backtest(CONFIG, data=data_df, optimize=True)
         logger.info("\n✓ Optimization completed successfully!\n")
         
     except Exception as e:
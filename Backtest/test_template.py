@@ -11,21 +11,53 @@ using the Backtrader framework. It includes:
 - Performance analysis and visualization
 - Results export
 
+Two engines are available (CONFIG['engine']):
+- 'vectorized' (default): indicators and crossover signals computed with
+  NumPy/pandas in one pass, trades simulated by jumping between signals
+- 'backtrader': the event-driven MovingAverageCrossStrategy, kept as a
+  validation mode for cross-checking the vectorized results
+
 Usage:
     1. Define your strategy logic in the Strategy class
     2. Configure parameters in the CONFIG section
     3. Run the script: python test_template.py
-    4. Review results and visualizations
+       (or call run_parameter_sweep with a list of configs for a grid)
+    4. Review results (python plot_results.py charts the trades file)
 
 Adapt this template for your specific strategy by modifying the Strategy class.
 """
 
 import backtrader as bt
+import numpy as np
 import pandas as pd
 import datetime
+import gc
 import logging
+from multiprocessing import shared_memory
 from pathlib import Path
 
+from joblib import Parallel, delayed
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Prefer the ahead-of-time build (python _sim_aot.py), then the JIT kernels
+try:
+    from sim_aot import fused_dual_sma, simulate_trades
+    SIM_COMPILED = True
+except ImportError:
+    from _sim_njit import NUMBA_AVAILABLE as SIM_COMPILED
+    from _sim_njit import _simulate_trades as simulate_trades
+    from _sim_njit import fused_dual_sma
+
+from _sim_njit import make_simulator
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,10 +72,12 @@ CONFIG = {
     # Data settings
     'data_file': 'datasets/historical_data.csv',  # Path to your data file
     'symbol': 'AAPL',  # Symbol to backtest (if multiple in file)
+    'cache_data': True,  # Keep parsed data as memory-mapped .npy files in datasets/cache/
     'start_date': datetime.datetime(2020, 1, 1),
     'end_date': datetime.datetime(2024, 1, 1),
     
     # Backtest settings
+    'engine': 'vectorized',  # 'vectorized' or 'backtrader' (validation mode)
     'initial_cash': 100000.0,
     'commission': 0.001,  # 0.1% per trade
     'slippage': 0.0005,   # 0.05% slippage
@@ -59,7 +93,8 @@ CONFIG = {
     # Output settings
     'save_results': True,
     'results_file': 'backtest_results.csv',
-    'plot_results': True,
+    'trades_file': 'backtest_trades.parquet',  # Plot with: python plot_results.py
+    'plot_results': False,  # Backtrader engine only; blocks until the window closes
 }
 
 
@@ -85,7 +120,7 @@ class MovingAverageCrossStrategy(bt.Strategy):
         ('slow_period', 50),
         ('stop_loss_pct', 0.02),
         ('position_size_pct', 0.95),
-        ('printlog', True),
+        ('printlog', False),
     )
     
     def __init__(self):
@@ -93,26 +128,33 @@ class MovingAverageCrossStrategy(bt.Strategy):
         # Keep reference to close price
         self.dataclose = self.datas[0].close
         
+        # Checked before building any log message, so disabled logging costs
+        # no string formatting
+        self._log_enabled = self.params.printlog
+        
+        # Params read on every bar, cached as plain attributes
+        self._pos_frac = self.params.position_size_pct
+        self._stop_loss_pct = self.params.stop_loss_pct
+        
         # Track pending orders and positions
         self.order = None
         self.buy_price = None
         self.buy_comm = None
+        self.buy_size = None
+        self.sell_price = None
         
-        # Add indicators
-        self.fast_ma = bt.indicators.SimpleMovingAverage(
-            self.datas[0],
-            period=self.params.fast_period
-        )
-        self.slow_ma = bt.indicators.SimpleMovingAverage(
-            self.datas[0],
-            period=self.params.slow_period
-        )
+        # Closed trades: (entry_date, exit_date, size, entry_price, exit_price, pnl, pnlcomm)
+        self.trade_log = []
         
-        # Crossover signal
-        self.crossover = bt.indicators.CrossOver(self.fast_ma, self.slow_ma)
+        # Moving averages precomputed once over the preloaded closes
+        # (indexed by bar in next() instead of updated per bar by Backtrader)
+        close = np.asarray(self.datas[0].close.array, dtype=PRICE_DTYPE)
+        self.fast_ma_arr, self.slow_ma_arr = dual_sma(
+            close, self.params.fast_period, self.params.slow_period
+        )
         
-        # Additional indicators for analysis
-        self.rsi = bt.indicators.RSI(self.datas[0])
+        # Crossover events (+1 up, -1 down) for every bar in one vectorized pass
+        self._events = crossover_events(self.fast_ma_arr, self.slow_ma_arr)
         
         logger.info(f"Strategy initialized with fast_period={self.params.fast_period}, "
                    f"slow_period={self.params.slow_period}")
@@ -128,20 +170,25 @@ class MovingAverageCrossStrategy(bt.Strategy):
             if order.isbuy():
                 self.buy_price = order.executed.price
                 self.buy_comm = order.executed.comm
-                self.log(
-                    f'BUY EXECUTED - Price: {order.executed.price:.2f}, '
-                    f'Cost: {order.executed.value:.2f}, '
-                    f'Commission: {order.executed.comm:.2f}'
-                )
+                self.buy_size = order.executed.size
+                if self._log_enabled:
+                    self.log(
+                        f'BUY EXECUTED - Price: {order.executed.price:.2f}, '
+                        f'Cost: {order.executed.value:.2f}, '
+                        f'Commission: {order.executed.comm:.2f}'
+                    )
             elif order.issell():
-                self.log(
-                    f'SELL EXECUTED - Price: {order.executed.price:.2f}, '
-                    f'Cost: {order.executed.value:.2f}, '
-                    f'Commission: {order.executed.comm:.2f}'
-                )
+                self.sell_price = order.executed.price
+                if self._log_enabled:
+                    self.log(
+                        f'SELL EXECUTED - Price: {order.executed.price:.2f}, '
+                        f'Cost: {order.executed.value:.2f}, '
+                        f'Commission: {order.executed.comm:.2f}'
+                    )
         
         elif order.status in [order.Canceled, order.Margin, order.Rejected]:
-            self.log(f'Order Canceled/Margin/Rejected: {order.status}')
+            if self._log_enabled:
+                self.log(f'Order Canceled/Margin/Rejected: {order.status}')
         
         # Reset order
         self.order = None
@@ -151,7 +198,12 @@ class MovingAverageCrossStrategy(bt.Strategy):
         if not trade.isclosed:
             return
         
-        self.log(f'TRADE PROFIT - Gross: {trade.pnl:.2f}, Net: {trade.pnlcomm:.2f}')
+        self.trade_log.append((
+            bt.num2date(trade.dtopen), bt.num2date(trade.dtclose), self.buy_size,
+            trade.price, self.sell_price, trade.pnl, trade.pnlcomm
+        ))
+        if self._log_enabled:
+            self.log(f'TRADE PROFIT - Gross: {trade.pnl:.2f}, Net: {trade.pnlcomm:.2f}')
     
     def next(self):
         """
@@ -159,23 +211,31 @@ class MovingAverageCrossStrategy(bt.Strategy):
         
         Implement your strategy rules here.
         """
+        # Attributes used more than once are read into locals once per bar
+        close = self.dataclose[0]
+        log_enabled = self._log_enabled
+        
         # Log current price
-        self.log(f'Close: {self.dataclose[0]:.2f}')
+        if log_enabled:
+            self.log(f'Close: {close:.2f}')
         
         # Check if an order is pending
         if self.order:
             return
         
+        event = self._events[len(self) - 1]
+        position = self.position
+        
         # Check if we are in the market
-        if not self.position:
+        if not position:
             # Not in market - look for buy signal
-            if self.crossover > 0:  # Fast MA crossed above slow MA
+            if event > 0:  # Fast MA crossed above slow MA
                 # Calculate position size
-                cash = self.broker.getcash()
-                size = int((cash * self.params.position_size_pct) / self.dataclose[0])
+                size = int((self.broker.getcash() * self._pos_frac) / close)
                 
                 if size > 0:
-                    self.log(f'BUY SIGNAL - Size: {size}')
+                    if log_enabled:
+                        self.log(f'BUY SIGNAL - Size: {size}')
                     # Keep order reference to avoid duplicate orders
                     self.order = self.buy(size=size)
         
@@ -183,58 +243,100 @@ class MovingAverageCrossStrategy(bt.Strategy):
             # In market - check exit conditions
             
             # Exit signal: Fast MA crosses below slow MA
-            if self.crossover < 0:
-                self.log(f'SELL SIGNAL - Closing position')
-                self.order = self.sell(size=self.position.size)
+            if event < 0:
+                if log_enabled:
+                    self.log(f'SELL SIGNAL - Closing position')
+                self.order = self.sell(size=position.size)
             
             # Stop loss check
             elif self.buy_price:
-                loss_pct = (self.dataclose[0] - self.buy_price) / self.buy_price
-                if loss_pct <= -self.params.stop_loss_pct:
-                    self.log(f'STOP LOSS TRIGGERED - Loss: {loss_pct*100:.2f}%')
-                    self.order = self.sell(size=self.position.size)
+                buy_price = self.buy_price
+                loss_pct = (close - buy_price) / buy_price
+                if loss_pct <= -self._stop_loss_pct:
+                    if log_enabled:
+                        self.log(f'STOP LOSS TRIGGERED - Loss: {loss_pct*100:.2f}%')
+                    self.order = self.sell(size=position.size)
     
     def log(self, txt, dt=None):
         """Logging function for strategy."""
-        if self.params.printlog:
-            dt = dt or self.datas[0].datetime.date(0)
-            print(f'{dt.isoformat()} - {txt}')
+        if not self._log_enabled:
+            return
+        dt = dt or self.datas[0].datetime.date(0)
+        print(f'{dt.isoformat()} - {txt}')
     
     def stop(self):
         """Called when backtest is finished."""
-        self.log(
-            f'Strategy Finished - Fast: {self.params.fast_period}, '
-            f'Slow: {self.params.slow_period}, '
-            f'Final Portfolio Value: {self.broker.getvalue():.2f}',
-            dt=None
-        )
+        if self._log_enabled:
+            self.log(
+                f'Strategy Finished - Fast: {self.params.fast_period}, '
+                f'Slow: {self.params.slow_period}, '
+                f'Final Portfolio Value: {self.broker.getvalue():.2f}',
+                dt=None
+            )
 
 
 # ==================== DATA LOADING ====================
 
-def load_data(config):
+# Price columns used by the engines (Backtrader's PandasData defaults)
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+OHLC_COLUMNS = ['open', 'high', 'low', 'close']
+
+# Prices are held in single precision: ~7 significant digits is well within
+# the tolerance of price data, and it halves the memory the kernels stream
+PRICE_DTYPE = np.float32
+
+
+def read_csv_arrow(data_file, symbol=None):
     """
-    Load and prepare data for backtesting.
+    Read a price CSV with PyArrow's multithreaded reader.
+    
+    OHLC columns are typed as float32 and dates parsed as timestamps during
+    the read; the symbol predicate is applied to the Arrow table before any
+    pandas conversion.
     
     Args:
-        config: Configuration dictionary
+        data_file: Path to the CSV file
+        symbol: Keep only rows for this symbol (if the file has a symbol column)
     
     Returns:
-        Backtrader data feed
+        DataFrame with the file's columns
+    """
+    convert_options = pacsv.ConvertOptions(
+        column_types={
+            **{col: pa.float32() for col in OHLC_COLUMNS},
+            'volume': pa.float64(),
+        }
+    )
+    table = pacsv.read_csv(data_file, convert_options=convert_options)
+    
+    if symbol and 'symbol' in table.column_names:
+        table = table.filter(pc.equal(table['symbol'], symbol))
+    
+    return table.to_pandas()
+
+
+def read_price_csv(data_file, symbol=None):
     """
-    logger.info(f"Loading data from {config['data_file']}")
+    Parse a price CSV into an OHLCV DataFrame indexed by date.
     
-    # Load data from CSV
-    df = pd.read_csv(config['data_file'])
+    Args:
+        data_file: Path to the CSV file
+        symbol: Keep only rows for this symbol (if the file has a symbol column)
     
-    # Filter for specific symbol if needed
-    if 'symbol' in df.columns and config.get('symbol'):
-        df = df[df['symbol'] == config['symbol']].copy()
-        logger.info(f"Filtered for symbol: {config['symbol']}")
+    Returns:
+        DataFrame of OHLCV bars indexed by date
+    """
+    # Load data from CSV, filtering for a specific symbol if needed
+    if PYARROW_AVAILABLE:
+        df = read_csv_arrow(data_file, symbol)
+    else:
+        df = pd.read_csv(data_file)
+        if 'symbol' in df.columns and symbol:
+            df = df[df['symbol'] == symbol].copy()
     
-    # Ensure date column is datetime
+    # Ensure date column is datetime (timezone-aware dates are kept as naive UTC)
     if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
+        df['date'] = pd.to_datetime(df['date'], utc=True).dt.tz_localize(None)
         df.set_index('date', inplace=True)
     
     # Standardize column names (Backtrader expects: open, high, low, close, volume)
@@ -248,6 +350,114 @@ def load_data(config):
     
     df = df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns})
     
+    # Single-precision prices (a no-op when the reader already produced them)
+    ohlc = [col for col in OHLC_COLUMNS if col in df.columns]
+    df[ohlc] = df[ohlc].astype(PRICE_DTYPE)
+    
+    return df
+
+
+def cache_dir_for(csv_path, symbol=None):
+    """
+    Directory of the .npy cache for a CSV file and symbol.
+    
+    Args:
+        csv_path: Path to the source CSV file
+        symbol: Symbol the cache is filtered for (None for all rows)
+    
+    Returns:
+        Path of the form <csv dir>/cache/<csv stem>_<symbol>
+    """
+    csv_path = Path(csv_path)
+    return csv_path.parent / 'cache' / f"{csv_path.stem}_{symbol or 'all'}"
+
+
+def _write_cache(df, cache_dir):
+    """Write each price column and the dates of df as .npy files."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            np.save(cache_dir / f'{col}.npy', df[col].to_numpy())
+    # Written last: its mtime marks the cache as complete
+    np.save(cache_dir / 'date.npy', df.index.to_numpy(dtype='datetime64[ns]'))
+
+
+def prepare_cache(csv_path, symbol=None):
+    """
+    Convert a price CSV into per-column .npy files for memory-mapped loading.
+    
+    Parsing the CSV is the slow part of loading; the cache lets repeated runs
+    (and every worker of a sweep) map the binary columns instead, served from
+    the OS page cache after the first read.
+    
+    Args:
+        csv_path: Path to the source CSV file
+        symbol: Keep only rows for this symbol
+    
+    Returns:
+        Path of the cache directory
+    """
+    cache_dir = cache_dir_for(csv_path, symbol)
+    _write_cache(read_price_csv(csv_path, symbol), cache_dir)
+    return cache_dir
+
+
+def load_cache(cache_dir):
+    """
+    Load a price cache written by prepare_cache.
+    
+    Args:
+        cache_dir: Cache directory
+    
+    Returns:
+        DataFrame of OHLCV bars indexed by date
+    """
+    cache_dir = Path(cache_dir)
+    columns = {
+        col: np.load(cache_dir / f'{col}.npy', mmap_mode='r')
+        for col in PRICE_COLUMNS if (cache_dir / f'{col}.npy').exists()
+    }
+    dates = np.load(cache_dir / 'date.npy', mmap_mode='r')
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(dates, name='date'))
+
+
+def load_data_df(config):
+    """
+    Load and prepare price data for backtesting.
+    
+    With CONFIG['cache_data'], the parsed CSV is kept as memory-mapped .npy
+    files next to it (see prepare_cache) and re-parsed only when the CSV is
+    newer than the cache.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        DataFrame of OHLCV bars indexed by date
+    """
+    data_file = config['data_file']
+    symbol = config.get('symbol')
+    logger.info(f"Loading data from {data_file}")
+    
+    if config.get('cache_data', False):
+        cache_dir = cache_dir_for(data_file, symbol)
+        stamp = cache_dir / 'date.npy'
+        if stamp.exists() and stamp.stat().st_mtime >= Path(data_file).stat().st_mtime:
+            df = load_cache(cache_dir)
+            logger.info(f"Loaded cached data from {cache_dir}")
+        else:
+            df = read_price_csv(data_file, symbol)
+            try:
+                _write_cache(df, cache_dir)
+                logger.info(f"Cached data to {cache_dir}")
+            except OSError as e:
+                logger.warning(f"Could not write data cache: {e}")
+    else:
+        df = read_price_csv(data_file, symbol)
+    
+    if symbol:
+        logger.info(f"Filtered for symbol: {symbol}")
+    
     # Filter date range
     if config.get('start_date'):
         df = df[df.index >= config['start_date']]
@@ -256,28 +466,374 @@ def load_data(config):
     
     logger.info(f"Data loaded: {len(df)} rows from {df.index.min()} to {df.index.max()}")
     
-    # Create Backtrader data feed
-    data = bt.feeds.PandasData(dataname=df)
+    return df
+
+
+def load_data(config):
+    """
+    Load data for backtesting as a Backtrader data feed.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        Backtrader data feed
+    """
+    return bt.feeds.PandasData(dataname=load_data_df(config))
+
+
+def price_arrays(df):
+    """
+    Split the OHLCV columns into separate contiguous arrays (SoA layout).
+    
+    The vectorized engine only reads open and close; as separate arrays each
+    cache line it pulls holds nothing but the column it needs. Columns that
+    are already contiguous PRICE_DTYPE are returned as views.
+    
+    Args:
+        df: Price DataFrame from load_data_df
+    
+    Returns:
+        Dictionary mapping each PRICE_COLUMNS name to a 1-D array
+    """
+    return {
+        col: np.ascontiguousarray(df[col].to_numpy(), dtype=PRICE_DTYPE)
+        for col in PRICE_COLUMNS if col in df.columns
+    }
+
+
+# ==================== VECTORIZED ENGINE ====================
+
+def sma_cumsum(close, period):
+    """
+    Simple moving average from a single cumulative sum.
+    
+    Args:
+        close: Close price array
+        period: Averaging window
+    
+    Returns:
+        Array the length and dtype of close, NaN until the first full window
+    """
+    # Accumulate in double precision; a float32 running sum drifts over long series
+    csum = np.concatenate(([0.0], np.cumsum(close, dtype=np.float64)))
+    sma = np.full(len(close), np.nan, dtype=close.dtype)
+    sma[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return sma
+
+
+def dual_sma(close, fast_period, slow_period):
+    """
+    Fast and slow simple moving averages of the same series.
+    
+    Uses the compiled single-pass fused_dual_sma kernel when available,
+    otherwise two sma_cumsum passes (identical results unless the series is
+    long enough for the cumulative sum to round).
+    
+    Args:
+        close: Close price array (PRICE_DTYPE)
+        fast_period: Fast SMA period
+        slow_period: Slow SMA period
+    
+    Returns:
+        Tuple of (fast SMA, slow SMA) arrays
+    """
+    if not SIM_COMPILED:
+        return sma_cumsum(close, fast_period), sma_cumsum(close, slow_period)
+    
+    close = np.ascontiguousarray(close, dtype=PRICE_DTYPE)
+    fast = np.empty_like(close)
+    slow = np.empty_like(close)
+    fused_dual_sma(close, fast_period, slow_period, fast, slow)
+    return fast, slow
+
+
+def compute_rsi(close, period=14):
+    """
+    Relative Strength Index over a full close series, for post-run analysis.
+    
+    Uses Wilder's smoothing like bt.indicators.RSI, but in one vectorized pass
+    instead of a per-bar indicator update.
+    
+    Args:
+        close: Close price Series
+        period: RSI period
+    
+    Returns:
+        RSI Series (0-100)
+    """
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def crossover_events(fast, slow):
+    """
+    Compute crossover events between two series in one vectorized pass.
+    
+    Matches bt.indicators.CrossOver: a bar where the fast series is strictly
+    above (below) the slow one counts as a cross up (down) if the last non-zero
+    difference before it had the opposite sign.
+    
+    Args:
+        fast: Fast moving average array (NaN during warm-up)
+        slow: Slow moving average array (NaN during warm-up)
+    
+    Returns:
+        Array of +1 (cross up), -1 (cross down) or 0 per bar
+    """
+    sign = np.sign(fast - slow)
+    
+    # Carry the last non-zero sign forward over bars where the averages are equal
+    last_nonzero = np.maximum.accumulate(np.where(sign != 0, np.arange(len(sign)), 0))
+    sign = sign[last_nonzero]
+    
+    cross = np.diff(sign, prepend=sign[:1])
+    return np.sign(np.nan_to_num(cross)).astype(np.int8)
+
+
+def _simulate_events(open_, close, fast, slow, stop_loss_pct, position_size_pct,
+                     cash, commission):
+    """
+    NumPy fallback for simulate_trades when Numba is not installed.
+    
+    Instead of stepping bar by bar, jumps from one entry signal to the next
+    exit (crossover or stop loss). Same arguments and return value as
+    _sim_njit._simulate_trades.
+    """
+    # Cash and P&L arithmetic in double precision, as in the compiled kernel
+    open_ = open_.astype(np.float64)
+    close = close.astype(np.float64)
+    n = len(close)
+    cross = crossover_events(fast, slow)
+    entries = np.flatnonzero(cross > 0)
+    exits = np.flatnonzero(cross < 0)
+    
+    equity = np.empty(n)
+    trades = []
+    position = 0
+    flat_from = 0  # First bar whose equity is plain cash
+    i = 0          # First bar at which a new entry signal may be taken
+    
+    while True:
+        k = entries.searchsorted(i)
+        if k == len(entries):
+            break
+        signal = entries[k]
+        fill = signal + 1
+        if fill >= n:
+            break  # Signal on the last bar never fills
+        
+        size = int((cash * position_size_pct) / close[signal])
+        if size <= 0:
+            i = signal + 1
+            continue
+        
+        cost = size * open_[fill]
+        entry_comm = cost * commission
+        if cost + entry_comm > cash:
+            i = fill  # Rejected for insufficient cash
+            continue
+        
+        equity[flat_from:fill] = cash
+        cash -= cost + entry_comm
+        entry_price = open_[fill]
+        
+        # Exit on the first cross down or stop-loss close, whichever comes first
+        k = exits.searchsorted(fill)
+        exit_signal = exits[k] if k < len(exits) else n
+        stopped = (close[fill:exit_signal] - entry_price) / entry_price <= -stop_loss_pct
+        if len(stopped):
+            hit = stopped.argmax()  # First True; argmax stops scanning there
+            if stopped[hit]:
+                exit_signal = fill + hit
+        
+        if exit_signal >= n - 1:
+            # Exit order never fills; the position is still open at the end
+            equity[fill:] = cash + size * close[fill:]
+            position = size
+            flat_from = n
+            break
+        
+        exit_fill = exit_signal + 1
+        equity[fill:exit_fill] = cash + size * close[fill:exit_fill]
+        proceeds = size * open_[exit_fill]
+        exit_comm = proceeds * commission
+        cash += proceeds - exit_comm
+        gross = size * (open_[exit_fill] - entry_price)
+        trades.append((fill, exit_fill, size, entry_price, open_[exit_fill],
+                       gross, gross - entry_comm - exit_comm))
+        
+        flat_from = exit_fill
+        i = exit_fill
+    
+    equity[flat_from:] = cash
+    
+    return equity, np.array(trades, dtype=np.float64).reshape(-1, 7), position
+
+
+def vectorized_sma_cross(prices, fast_period, slow_period, stop_loss_pct, position_size_pct,
+                         cash, commission=0.0, specialize=False):
+    """
+    Backtest the moving average crossover rules without the Backtrader event loop.
+    
+    The moving averages are computed vectorized; the fill / stop-loss loop runs
+    in the compiled simulate_trades kernel (or its NumPy fallback). Signals are
+    evaluated on the close and filled at the next bar's open, a buy the cash
+    cannot cover at that open is rejected, and commission is charged on both
+    legs, as with Backtrader's default broker.
+    
+    Args:
+        prices: Per-column price arrays (see price_arrays)
+        fast_period: Fast SMA period
+        slow_period: Slow SMA period
+        stop_loss_pct: Stop loss as a fraction of entry price
+        position_size_pct: Fraction of cash committed per entry
+        cash: Starting cash
+        commission: Commission as a fraction of traded value
+        specialize: Use a kernel compiled for this period pair (make_simulator);
+            costs a compile per new pair, so off by default
+    
+    Returns:
+        Dictionary with the equity curve, closed trades, open position size
+        and final portfolio value. Each trade row is [entry_idx, exit_idx,
+        size, entry_price, exit_price, gross_pnl, net_pnl].
+    """
+    close = prices['close']
+    open_ = prices['open']
+    costs = (float(stop_loss_pct), float(position_size_pct), float(cash), float(commission))
+    
+    if specialize and SIM_COMPILED:
+        simulate = make_simulator(fast_period, slow_period)
+        equity, trades, position = simulate(open_, close, *costs)
+    else:
+        fast, slow = dual_sma(close, fast_period, slow_period)
+        simulate = simulate_trades if SIM_COMPILED else _simulate_events
+        equity, trades, position = simulate(open_, close, fast, slow, *costs)
+    
+    return {
+        'equity': equity,
+        'trades': trades,
+        'open_size': position,
+        'final_value': equity[-1] if len(equity) else cash,
+    }
+
+
+# ==================== PERFORMANCE METRICS ====================
+
+# Defaults of the Backtrader analyzers the 'backtrader' engine reports
+SHARPE_RISKFREE_RATE = 0.01  # bt.analyzers.SharpeRatio, on calendar-year returns
+TRADING_DAYS_PER_YEAR = 252  # bt.analyzers.Returns annualization for daily bars
+
+
+def compute_metrics(equity, trades, dates, initial_cash, open_size=0):
+    """
+    Compute performance metrics from an equity curve and its trades.
+    
+    Replaces the SharpeRatio, DrawDown, Returns and TradeAnalyzer analyzers
+    for the vectorized engine with a few NumPy passes over the finished
+    curve, following the analyzers' definitions so both engines report
+    comparable numbers.
+    
+    Args:
+        equity: Portfolio value at each bar's close
+        trades: Closed trade rows from vectorized_sma_cross
+        dates: DatetimeIndex of the bars
+        initial_cash: Starting cash
+        open_size: Size of the position still open at the end
+    
+    Returns:
+        Dictionary of result metrics (same keys as the Backtrader engine)
+    """
+    final_value = equity[-1] if len(equity) else initial_cash
     
-    return data
+    sharpe = None
+    max_drawdown = 0.0
+    annual_return = 0.0
+    if len(equity):
+        # Sharpe ratio over calendar-year returns
+        years = dates.year.to_numpy()
+        year_end = np.append(np.flatnonzero(np.diff(years)), len(years) - 1)
+        values = np.concatenate(([initial_cash], equity[year_end]))
+        excess = values[1:] / values[:-1] - 1 - SHARPE_RISKFREE_RATE
+        if excess.std() > 0:
+            sharpe = excess.mean() / excess.std()
+        
+        # Maximum drawdown (percent)
+        peak = np.maximum.accumulate(equity)
+        max_drawdown = ((peak - equity) / peak).max() * 100
+        
+        # Annualized (normalized) return
+        annual_return = (np.exp(np.log(final_value / initial_cash) / len(equity)
+                                * TRADING_DAYS_PER_YEAR) - 1) * 100
+    
+    # Trade stats (an open position counts towards the total only)
+    pnl = trades[:, 6]
+    
+    return {
+        'final_value': final_value,
+        'total_return': ((final_value - initial_cash) / initial_cash) * 100,
+        'sharpe': sharpe,
+        'max_drawdown': max_drawdown,
+        'annual_return': annual_return,
+        'total_trades': len(pnl) + (1 if open_size else 0),
+        'won_trades': int((pnl >= 0).sum()),
+        'lost_trades': int((pnl < 0).sum()),
+    }
 
 
 # ==================== BACKTEST EXECUTION ====================
 
-def run_backtest(config):
+def run_backtest(config, df=None, verbose=True, arrays=None):
     """
     Execute backtest with given configuration.
     
     Args:
         config: Configuration dictionary
+        df: Preloaded price DataFrame (loaded from config['data_file'] if None)
+        verbose: Log progress and results
+        arrays: Per-column price arrays of df (see price_arrays); derived
+            from df if None. Only used by the vectorized engine.
     
     Returns:
-        Cerebro instance with results
+        Dictionary of strategy parameters and result metrics
     """
-    logger.info("=" * 60)
-    logger.info("Starting Backtest")
-    logger.info("=" * 60)
+    if verbose:
+        logger.info("=" * 60)
+        logger.info("Starting Backtest")
+        logger.info("=" * 60)
+    
+    if df is None:
+        df = load_data_df(config)
+    
+    if verbose:
+        logger.info(f"Initial Portfolio Value: ${config['initial_cash']:,.2f}")
+        logger.info(f"Commission: {config['commission']*100}%")
+    
+    if config.get('engine', 'vectorized') == 'vectorized':
+        metrics = run_vectorized(config, df, price_arrays(df) if arrays is None else arrays)
+    else:
+        metrics = run_backtrader(config, df, verbose)
+    
+    if verbose:
+        print_results(metrics)
+    
+    return metrics
+
+
+def run_backtrader(config, df, verbose=True):
+    """
+    Execute the backtest on the Backtrader engine.
     
+    Args:
+        config: Configuration dictionary
+        df: Price DataFrame
+        verbose: Log progress
+    
+    Returns:
+        Dictionary of strategy parameters and result metrics
+    """
     # Create cerebro instance
     cerebro = bt.Cerebro()
     
@@ -287,17 +843,12 @@ def run_backtest(config):
         **config['strategy_params']
     )
     
-    # Load and add data
-    data = load_data(config)
-    cerebro.adddata(data)
+    # Add data
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
     
-    # Set initial cash
+    # Set initial cash and commission
     cerebro.broker.setcash(config['initial_cash'])
-    logger.info(f"Initial Portfolio Value: ${config['initial_cash']:,.2f}")
-    
-    # Set commission
     cerebro.broker.setcommission(commission=config['commission'])
-    logger.info(f"Commission: {config['commission']*100}%")
     
     # Add analyzers
     cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
@@ -306,61 +857,267 @@ def run_backtest(config):
     cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
     
     # Run backtest
-    logger.info("\nRunning backtest...\n")
+    if verbose:
+        logger.info("\nRunning backtest...\n")
     results = cerebro.run()
     
     # Get strategy instance
     strat = results[0]
     
-    # Print results
-    logger.info("=" * 60)
-    logger.info("Backtest Results")
-    logger.info("=" * 60)
-    
     final_value = cerebro.broker.getvalue()
-    total_return = ((final_value - config['initial_cash']) / config['initial_cash']) * 100
+    trades = strat.analyzers.trades.get_analysis()
     
-    logger.info(f"Final Portfolio Value: ${final_value:,.2f}")
-    logger.info(f"Total Return: {total_return:.2f}%")
+    metrics = {
+        **config['strategy_params'],
+        'final_value': final_value,
+        'total_return': ((final_value - config['initial_cash']) / config['initial_cash']) * 100,
+        'sharpe': strat.analyzers.sharpe.get_analysis().get('sharperatio'),
+        'max_drawdown': strat.analyzers.drawdown.get_analysis().get('max', {}).get('drawdown'),
+        'annual_return': strat.analyzers.returns.get_analysis().get('rnorm100'),
+        'total_trades': trades.get('total', {}).get('total', 0),
+        'won_trades': trades.get('won', {}).get('total', 0),
+        'lost_trades': trades.get('lost', {}).get('total', 0),
+    }
     
-    # Sharpe Ratio
-    sharpe = strat.analyzers.sharpe.get_analysis()
-    logger.info(f"Sharpe Ratio: {sharpe.get('sharperatio', 'N/A')}")
+    if config.get('save_results') and config.get('trades_file'):
+        save_trades_parquet(strat, config['trades_file'])
+    
+    # Plot if requested
+    if config.get('plot_results', False):
+        logger.info("\nGenerating plots...")
+        cerebro.plot(style='candlestick', barup='green', bardown='red')
+    
+    return metrics
+
+
+def run_vectorized(config, df, arrays):
+    """
+    Execute the backtest on the vectorized engine.
     
-    # Drawdown
-    drawdown = strat.analyzers.drawdown.get_analysis()
-    logger.info(f"Max Drawdown: {drawdown.get('max', {}).get('drawdown', 'N/A'):.2f}%")
+    Args:
+        config: Configuration dictionary
+        df: Price DataFrame (for trade dates)
+        arrays: Per-column price arrays of df
     
-    # Returns
-    returns = strat.analyzers.returns.get_analysis()
-    logger.info(f"Annualized Return: {returns.get('rnorm100', 'N/A'):.2f}%")
+    Returns:
+        Dictionary of strategy parameters and result metrics
+    """
+    params = config['strategy_params']
+    result = vectorized_sma_cross(
+        arrays,
+        params['fast_period'],
+        params['slow_period'],
+        params['stop_loss_pct'],
+        params['position_size_pct'],
+        config['initial_cash'],
+        config['commission']
+    )
     
-    # Trade stats
-    trades = strat.analyzers.trades.get_analysis()
-    total_trades = trades.get('total', {}).get('total', 0)
-    won_trades = trades.get('won', {}).get('total', 0)
-    lost_trades = trades.get('lost', {}).get('total', 0)
+    trades = result['trades']
     
+    if config.get('save_results') and config.get('trades_file'):
+        entry_idx = trades[:, 0].astype(np.int64)
+        exit_idx = trades[:, 1].astype(np.int64)
+        write_trades_parquet(
+            [df.index[entry_idx], df.index[exit_idx], trades[:, 2].astype(np.int64),
+             *trades[:, 3:].T],
+            config['trades_file']
+        )
+    
+    if config.get('plot_results', False):
+        logger.warning("Plotting is only available with engine='backtrader'; "
+                       "use plot_results.py on the trades file instead")
+    
+    return {
+        **params,
+        **compute_metrics(result['equity'], trades, df.index, config['initial_cash'],
+                          result['open_size']),
+    }
+
+
+def print_results(metrics):
+    """
+    Print backtest metrics.
+    
+    Args:
+        metrics: Dictionary returned by run_backtest
+    """
+    logger.info("=" * 60)
+    logger.info("Backtest Results")
+    logger.info("=" * 60)
+    
+    logger.info(f"Final Portfolio Value: ${metrics['final_value']:,.2f}")
+    logger.info(f"Total Return: {metrics['total_return']:.2f}%")
+    
+    if 'sharpe' in metrics:
+        logger.info(f"Sharpe Ratio: {metrics['sharpe'] if metrics['sharpe'] is not None else 'N/A'}")
+    if metrics.get('max_drawdown') is not None:
+        logger.info(f"Max Drawdown: {metrics['max_drawdown']:.2f}%")
+    if metrics.get('annual_return') is not None:
+        logger.info(f"Annualized Return: {metrics['annual_return']:.2f}%")
+    
+    # Trade stats
+    total_trades = metrics['total_trades']
     logger.info(f"\nTotal Trades: {total_trades}")
     if total_trades > 0:
-        win_rate = (won_trades / total_trades) * 100
-        logger.info(f"Won: {won_trades}, Lost: {lost_trades}, Win Rate: {win_rate:.2f}%")
+        win_rate = (metrics['won_trades'] / total_trades) * 100
+        logger.info(f"Won: {metrics['won_trades']}, Lost: {metrics['lost_trades']}, "
+                    f"Win Rate: {win_rate:.2f}%")
     
     logger.info("=" * 60)
+
+
+# ==================== RESULTS EXPORT ====================
+
+# Columns of the trades file, one row per closed trade
+TRADE_COLUMNS = ['entry_date', 'exit_date', 'size', 'entry_price', 'exit_price', 'pnl', 'pnlcomm']
+
+
+def write_trades_parquet(columns, path):
+    """
+    Write closed trades to a Parquet file.
     
-    # Plot if requested
-    if config.get('plot_results', True):
-        logger.info("\nGenerating plots...")
-        cerebro.plot(style='candlestick', barup='green', bardown='red')
+    Args:
+        columns: Sequence of column arrays in TRADE_COLUMNS order
+        path: Output file path
+    """
+    if not PYARROW_AVAILABLE:
+        logger.warning("pyarrow is not installed; skipping trades file")
+        return
+    
+    table = pa.Table.from_pydict(dict(zip(TRADE_COLUMNS, columns)))
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path)
+    logger.info(f"Trades saved to {path}")
+
+
+def save_trades_parquet(strat, path):
+    """
+    Write the closed trades of a finished Backtrader strategy to Parquet.
+    
+    Args:
+        strat: MovingAverageCrossStrategy instance returned by cerebro.run()
+        path: Output file path
+    """
+    columns = list(zip(*strat.trade_log)) or [[] for _ in TRADE_COLUMNS]
+    write_trades_parquet(columns, path)
+
+
+# ==================== PARAMETER SWEEP ====================
+
+def _share_prices(df):
+    """
+    Copy the dates and OHLCV columns of df into one SharedMemory segment.
+    
+    Prices are stored as PRICE_DTYPE, volume and dates (int64-backed
+    datetime64) keep their dtype; each column starts on an 8-byte boundary.
+    
+    Args:
+        df: Price DataFrame from load_data_df
+    
+    Returns:
+        Tuple of (SharedMemory segment, layout), where layout lists the
+        (name, dtype, byte offset) of every column; the index is stored under
+        its own name (or 'date')
+    """
+    index_name = df.index.name or 'date'
+    columns = {index_name: df.index.to_numpy()}
+    columns.update((col, df[col].to_numpy(dtype=PRICE_DTYPE)) for col in OHLC_COLUMNS)
+    columns['volume'] = df['volume'].to_numpy()
+    
+    layout = []
+    offset = 0
+    for name, arr in columns.items():
+        layout.append((name, arr.dtype.str, offset))
+        offset += -(-arr.nbytes // 8) * 8
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (name, dtype, col_offset), arr in zip(layout, columns.values()):
+        np.ndarray(len(arr), dtype=dtype, buffer=shm.buf, offset=col_offset)[:] = arr
+    return shm, layout
+
+
+def _attach_prices(shm, layout, n_rows):
+    """
+    Map a segment written by _share_prices into a DataFrame without copying it.
+    
+    Args:
+        shm: Attached SharedMemory segment
+        layout: Column layout returned by _share_prices
+        n_rows: Number of price rows
+    
+    Returns:
+        Tuple of (price DataFrame, per-column price arrays), both backed by
+        the shared segment
+    """
+    columns = {
+        name: np.ndarray(n_rows, dtype=dtype, buffer=shm.buf, offset=offset)
+        for name, dtype, offset in layout
+    }
+    index_name = layout[0][0]
+    index = pd.DatetimeIndex(columns.pop(index_name), name=index_name, copy=False)
+    df = pd.DataFrame(columns, index=index, copy=False)
+    return df, columns
+
+
+def _sweep_worker(config, shm_name, layout, n_rows):
+    """Run one sweep backtest against the shared price block."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        df, arrays = _attach_prices(shm, layout, n_rows)
+        result = run_backtest(config, df=df, verbose=False, arrays=arrays)
+        del df, arrays
+        return result
+    finally:
+        # Backtrader's cerebro/strategy reference cycles can still hold views
+        # of the segment; collect them so the mapping can be closed
+        gc.collect()
+        shm.close()
+
+
+def run_parameter_sweep(configs, n_jobs=-1):
+    """
+    Run independent backtests in parallel worker processes.
+    
+    The price data is loaded once (from the first config) and placed in a
+    SharedMemory segment, dates included, that each task maps for the length
+    of its backtest, so the CSV is not re-read per backtest. All configs must
+    therefore use the same data file, symbol and date range. Plotting, trade
+    files and per-run logging are disabled on workers.
+    
+    Args:
+        configs: List of configuration dictionaries
+        n_jobs: Number of worker processes (-1 for all cores)
+    
+    Returns:
+        List of metrics dictionaries, in the order of configs
+    """
+    if not configs:
+        return []
+    
+    df = load_data_df(configs[0])
+    shm, layout = _share_prices(df)
+    try:
+        logger.info(f"Running {len(configs)} backtests (n_jobs={n_jobs})")
+        results = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_sweep_worker)(
+                {**cfg, 'plot_results': False, 'save_results': False},
+                shm.name, layout, len(df)
+            )
+            for cfg in configs
+        )
+    finally:
+        shm.close()
+        shm.unlink()
     
-    return cerebro, results
+    return results
 
 
 # ==================== MAIN EXECUTION ====================
 
 if __name__ == '__main__':
     try:
-        cerebro, results = run_backtest(CONFIG)
+        run_backtest(CONFIG)
         logger.info("\n✓ Backtest completed successfully!")
     except Exception as e:
         logger.error(f"\n✗ Backtest failed: {str(e)}")